@@ -0,0 +1,56 @@
+"""
+Synthetic datasets for benchmarking the training pipeline.
+"""
+
+import numpy as np
+import pandas as pd
+
+# Levels of each high-cardinality categorical feature, above PyCaret's
+# one-hot limit so these columns go through its target encoding path
+CATEGORY_LEVELS = 500
+
+FEATURE_KINDS = ['numeric', 'categorical']
+
+
+def make_dataset(
+    problem_type: str,
+    rows: int,
+    columns: int,
+    feature_kind: str = "numeric",
+    seed: int = 0
+) -> pd.DataFrame:
+    """
+    Build a dataset with a learnable target column named "target".
+
+    `columns` counts the target. With the "categorical" kind, half of the
+    features are high-cardinality string columns that carry part of the signal.
+    Classification targets have three balanced classes, regression targets
+    are continuous.
+    """
+    rng = np.random.default_rng(seed)
+    n_features = max(columns - 1, 1)
+    n_categorical = n_features // 2 if feature_kind == "categorical" else 0
+    n_numeric = n_features - n_categorical
+
+    data = {}
+    signal = np.zeros(rows)
+
+    numeric = rng.normal(size=(rows, n_numeric))
+    weights = rng.normal(size=n_numeric)
+    for i in range(n_numeric):
+        data[f"num_{i}"] = numeric[:, i]
+    # Only the first few features are informative, the rest are noise
+    signal += numeric[:, :5] @ weights[:5]
+
+    for i in range(n_categorical):
+        codes = rng.integers(0, CATEGORY_LEVELS, size=rows)
+        data[f"cat_{i}"] = pd.Series(codes).map("level_{}".format).to_numpy()
+        signal += (codes % 7 - 3) * 0.2
+
+    score = signal + rng.normal(scale=0.5, size=rows)
+    if problem_type == "classification":
+        data["target"] = np.digitize(score, np.quantile(score, [1 / 3, 2 / 3]))
+    else:
+        data["target"] = score
+
+    return pd.DataFrame(data)
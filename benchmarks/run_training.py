@@ -0,0 +1,398 @@
+"""
+Offline benchmark of the training pipeline on synthetic datasets.
+
+Uploads synthetic CSV files through TrainService.train_model for a grid of
+dataset shapes, the same path as /model/train: upload hashing, CSV read and
+sampling, profiling, admission, and the pipeline in a training_pool worker
+(including its start-up and the transfer of the dataset). The wall time and
+peak RSS of every stage event the job reports are written to a JSON file.
+MongoDB is not used: collections are replaced by an in-memory fake.
+
+Usage:
+    python -m benchmarks.run_training --grid quick --output benchmarks/results/quick.json
+    python -m benchmarks.run_training --grid full --baseline benchmarks/results/before.json
+"""
+
+import os
+
+# Settings are read on import, so the environment is prepared first.
+# Benchmark processes never connect to MongoDB.
+os.environ.setdefault("MONGODB_URL", "mongodb://localhost:27017")
+os.environ.setdefault("MONGODB_DB_NAME", "automl_benchmark")
+
+import argparse
+import asyncio
+import json
+import logging
+import multiprocessing
+import platform
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from itertools import product
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+
+import psutil
+
+from benchmarks.datasets import FEATURE_KINDS, make_dataset
+
+logger = logging.getLogger(__name__)
+
+MB = 1024 * 1024
+
+# Row counts are given as fractions of the cell budget's row limit for the
+# dataset width, so the grid covers sampling ("beyond" the limit) at any width
+GRIDS = {
+    "quick": {
+        "problem_types": ['classification', 'regression'],
+        "row_fractions": [0.1, 2.0],
+        "columns": [5, 20],
+        "feature_kinds": FEATURE_KINDS
+    },
+    "full": {
+        "problem_types": ['classification', 'regression'],
+        "row_fractions": [0.1, 0.5, 1.0, 2.0],
+        "columns": [5, 20, 50],
+        "feature_kinds": FEATURE_KINDS
+    }
+}
+
+# Settings that change how fast /model/train is, recorded with the results
+RECORDED_SETTINGS = [
+    'MAX_DATASET_CELLS',
+    'MAX_DATASET_COLUMNS',
+    'PYCARET_TURBO_MODE',
+    'PYCARET_LIGHTWEIGHT_MODELS',
+    'PARALLEL_CANDIDATES',
+    'CANDIDATE_MAX_WORKERS',
+    'EXPERIMENT_CACHE_ENABLED',
+    'EAGER_PLOTS',
+    'PARALLEL_PLOTS',
+    'TRAINING_EXECUTOR',
+    'TRAINING_START_METHOD',
+    'WORKER_PRELOAD',
+    'WORKER_WARMUP_FIT'
+]
+
+
+class StageRecorder:
+    """Records wall time and peak RSS (including child processes) between stages."""
+
+    def __init__(self, interval: float = 0.05):
+        self.interval = interval
+        self.process = psutil.Process()
+        self.stages: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._peak = 0
+        self._start = 0.0
+        self._last = 0.0
+
+    def _rss(self) -> int:
+        total = self.process.memory_info().rss
+        for child in self.process.children(recursive=True):
+            try:
+                total += child.memory_info().rss
+            except psutil.NoSuchProcess:
+                continue
+        return total
+
+    def _sample(self) -> None:
+        while not self._stop.wait(self.interval):
+            rss = self._rss()
+            with self._lock:
+                self._peak = max(self._peak, rss)
+
+    def start(self) -> None:
+        self._peak = self._rss()
+        self._start = self._last = time.time()
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def mark(self, stage: str, elapsed: Optional[float] = None, **details) -> None:
+        """
+        Close the current stage, starting the next one.
+
+        elapsed is the time the stage ended at, in seconds since start();
+        stage events carry it, since some are published after the fact.
+        """
+        now = self._start + elapsed if elapsed is not None else time.time()
+        rss = self._rss()
+        with self._lock:
+            peak = max(self._peak, rss)
+            self._peak = rss
+        self.stages.append({
+            "stage": stage,
+            "seconds": round(max(now - self._last, 0.0), 4),
+            "peak_rss_mb": round(peak / MB, 1),
+            **details
+        })
+        self._last = max(now, self._last)
+
+
+class InMemoryCollection:
+    """The part of an async MongoDB collection the training path uses, kept in memory."""
+
+    def __init__(self):
+        self.documents: List[Dict[str, Any]] = []
+
+    @staticmethod
+    def _matches(document: Dict[str, Any], filter: Dict[str, Any]) -> bool:
+        for key, value in filter.items():
+            if isinstance(value, dict) and "$in" in value:
+                if document.get(key) not in value["$in"]:
+                    return False
+            elif document.get(key) != value:
+                return False
+        return True
+
+    async def find_one(self, filter: Dict[str, Any], projection=None, sort=None) -> Optional[Dict[str, Any]]:
+        matches = [document for document in self.documents if self._matches(document, filter)]
+        for key, direction in reversed(sort or []):
+            matches.sort(key=lambda document: document.get(key), reverse=direction < 0)
+        return dict(matches[0]) if matches else None
+
+    async def insert_one(self, document: Dict[str, Any]):
+        self.documents.append(dict(document))
+        return SimpleNamespace(inserted_id=document.get("_id"))
+
+    async def update_one(self, filter: Dict[str, Any], update: Dict[str, Any], upsert: bool = False):
+        document = next((document for document in self.documents if self._matches(document, filter)), None)
+        if document is None:
+            if not upsert:
+                return SimpleNamespace(matched_count=0, modified_count=0)
+            document = dict(filter)
+            document.update(update.get("$setOnInsert", {}))
+            self.documents.append(document)
+        document.update(update.get("$set", {}))
+        return SimpleNamespace(matched_count=1, modified_count=1)
+
+
+class InMemoryDatabase:
+    """Collections by name, standing in for mongodb.get_collection."""
+
+    def __init__(self):
+        self.collections: Dict[str, InMemoryCollection] = {}
+
+    def get_collection(self, collection_name: str) -> InMemoryCollection:
+        return self.collections.setdefault(collection_name, InMemoryCollection())
+
+
+def build_cases(grid: str) -> List[Dict[str, Any]]:
+    """Expand a named grid into benchmark cases."""
+    from utils.sampling import DatasetSampler
+
+    spec = GRIDS[grid]
+    cases = []
+    for problem_type, columns, feature_kind, row_fraction in product(
+        spec["problem_types"], spec["columns"], spec["feature_kinds"], spec["row_fractions"]
+    ):
+        rows = max(100, int(DatasetSampler.row_budget(columns) * row_fraction))
+        cases.append({
+            "name": f"{problem_type}_{feature_kind}_{rows}x{columns}",
+            "problem_type": problem_type,
+            "rows": rows,
+            "columns": columns,
+            "feature_kind": feature_kind
+        })
+    return cases
+
+
+def run_case(case: Dict[str, Any], model_types: Optional[List[str]]) -> Dict[str, Any]:
+    """Train one case through TrainService.train_model and measure every stage."""
+    result = {**case, "error": None}
+
+    with tempfile.TemporaryDirectory(prefix="benchmark_") as workdir:
+        csv_path = Path(workdir) / f"{case['name']}.csv"
+        make_dataset(case["problem_type"], case["rows"], case["columns"], case["feature_kind"]).to_csv(
+            csv_path, index=False
+        )
+        result["csv_mb"] = round(csv_path.stat().st_size / MB, 2)
+        result.update(asyncio.run(_train_case(case, csv_path, model_types)))
+
+    return result
+
+
+async def _train_case(case: Dict[str, Any], csv_path: Path, model_types: Optional[List[str]]) -> Dict[str, Any]:
+    from fastapi import UploadFile
+
+    from db.mongodb import mongodb
+    from schemas.request_schemas import ModelTrainRequest
+    from services.job_tracker import job_tracker
+    from services.train_service import TrainService
+    from services.worker_pool import training_pool
+
+    database = InMemoryDatabase()
+    mongodb.get_collection = database.get_collection
+    result: Dict[str, Any] = {"error": None}
+
+    # Start the fork server with its preloads first, as the API does at startup
+    warm_up_start = time.time()
+    await training_pool.warm_up()
+    result["warm_up_seconds"] = round(time.time() - warm_up_start, 4)
+
+    recorder = StageRecorder()
+    publish = job_tracker.publish
+
+    def record(job_id: str, event: Dict[str, Any]) -> None:
+        recorder.mark(
+            event["stage"], event.get("elapsed"), **({"model_id": event["model_id"]} if "model_id" in event else {})
+        )
+        publish(job_id, event)
+
+    # Stages are timed from the events the job publishes, including those sent by the worker
+    job_tracker.publish = record
+    recorder.start()
+    model_filename = None
+
+    try:
+        request = ModelTrainRequest(
+            user_id="benchmark",
+            target_column="target",
+            dataset_name=case["name"],
+            model_types=model_types
+        )
+        with open(csv_path, 'rb') as f:
+            training = await TrainService().train_model(UploadFile(f, filename=csv_path.name), request)
+
+        model_filename = training["filename"]
+        job_doc = await database.get_collection("model_jobs").find_one({"filename": model_filename})
+        result["rows_trained"] = job_doc["dataset_rows"]
+        result["best_model"] = training["best_model"]
+        result["best_score"] = training["best_model_score"]
+
+    except Exception as e:
+        logger.exception(f"Benchmark case {case['name']} failed")
+        result["error"] = f"{type(e).__name__}: {e}"
+
+    finally:
+        recorder.stop()
+        job_tracker.publish = publish
+        training_pool.shutdown()
+        if model_filename is None:
+            job_doc = await database.get_collection("model_jobs").find_one({"user_id": "benchmark"})
+            model_filename = job_doc["filename"] if job_doc else None
+        if model_filename:
+            _remove_artifacts(model_filename)
+
+    result["stages"] = recorder.stages
+    result["total_seconds"] = round(sum(stage["seconds"] for stage in recorder.stages), 4)
+    result["peak_rss_mb"] = max((stage["peak_rss_mb"] for stage in recorder.stages), default=None)
+    return result
+
+
+def _remove_artifacts(model_filename: str) -> None:
+    """Delete the model, candidate, snapshot and plot files a case wrote to storage."""
+    from config import settings
+
+    stem = Path(model_filename).stem
+    for directory in [settings.models_dir, settings.snapshots_dir, settings.plots_dir]:
+        for path in directory.glob(f"*{stem}*"):
+            path.unlink(missing_ok=True)
+
+
+def environment_info() -> Dict[str, Any]:
+    """Versions and hardware the results were measured on."""
+    from importlib.metadata import PackageNotFoundError, version
+
+    packages = {}
+    for package in ['pycaret', 'scikit-learn', 'pandas', 'numpy', 'lightgbm', 'xgboost']:
+        try:
+            packages[package] = version(package)
+        except PackageNotFoundError:
+            packages[package] = None
+
+    return {
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "memory_mb": round(psutil.virtual_memory().total / MB),
+        "packages": packages
+    }
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Compare total time and peak RSS of the cases found in both result files."""
+    baseline_cases = {case["name"]: case for case in baseline["cases"] if not case["error"]}
+    rows = []
+    for case in results["cases"]:
+        before = baseline_cases.get(case["name"])
+        if case["error"] or before is None:
+            continue
+        rows.append({
+            "name": case["name"],
+            "seconds_before": before["total_seconds"],
+            "seconds_after": case["total_seconds"],
+            "time_ratio": round(case["total_seconds"] / before["total_seconds"], 3) if before["total_seconds"] else None,
+            "rss_mb_before": before["peak_rss_mb"],
+            "rss_mb_after": case["peak_rss_mb"]
+        })
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the training pipeline on synthetic datasets.")
+    parser.add_argument("--grid", choices=list(GRIDS), default="quick", help="Grid of dataset shapes to run")
+    parser.add_argument("--models", default=None, help="Comma-separated model ids (default: PYCARET_LIGHTWEIGHT_MODELS)")
+    parser.add_argument("--only", default=None, help="Run only cases whose name contains this text")
+    parser.add_argument("--output", default="benchmarks/results/latest.json", help="JSON results file to write")
+    parser.add_argument("--baseline", default=None, help="Earlier results file to compare against")
+    parser.add_argument("--with-cache", action="store_true", help="Keep the experiment cache enabled")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING, format="%(levelname)s %(name)s: %(message)s")
+
+    # Cached experiments would make repeated runs measure the cache, not the pipeline;
+    # set before settings are imported so the spawned case processes inherit it
+    os.environ["EXPERIMENT_CACHE_ENABLED"] = "true" if args.with_cache else "false"
+
+    from config import settings
+
+    model_types = args.models.split(",") if args.models else None
+    cases = [case for case in build_cases(args.grid) if not args.only or args.only in case["name"]]
+
+    results = {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "grid": args.grid,
+        "model_types": model_types or settings.PYCARET_LIGHTWEIGHT_MODELS,
+        "environment": environment_info(),
+        "settings": {name: getattr(settings, name) for name in RECORDED_SETTINGS},
+        "cases": []
+    }
+
+    for index, case in enumerate(cases, start=1):
+        # A fresh process per case, so peak RSS is not inherited from earlier cases
+        with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as executor:
+            case_result = executor.submit(run_case, case, model_types).result()
+
+        results["cases"].append(case_result)
+        status = case_result["error"] or f"{case_result['total_seconds']:.1f}s, {case_result['peak_rss_mb']} MB peak"
+        print(f"[{index}/{len(cases)}] {case['name']}: {status}", flush=True)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            results["comparison"] = compare(results, json.load(f))
+        for row in results["comparison"]:
+            print(
+                f"{row['name']}: {row['seconds_before']:.1f}s -> {row['seconds_after']:.1f}s "
+                f"(x{row['time_ratio']}), {row['rss_mb_before']} -> {row['rss_mb_after']} MB"
+            )
+
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(results, f, indent=2, default=str)
+    print(f"Results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -36,9 +36,19 @@ class Settings(BaseSettings):
     def eda_reports_dir(self) -> Path:
         return self.storage_dir / "eda_reports"
     
+    @property
+    def snapshots_dir(self) -> Path:
+        return self.storage_dir / "snapshots"
+    
+    @property
+    def experiment_cache_dir(self) -> Path:
+        return self.storage_dir / "experiment_cache"
+    
     # Dataset Limits (Render Free Tier Safe)
-    MAX_DATASET_ROWS: int = Field(5000)
+    MAX_DATASET_CELLS: int = Field(250000)
     MAX_DATASET_COLUMNS: int = Field(50)
+    SAMPLING_MAX_STRATA: int = Field(50)
+    SAMPLING_MIN_CLASS_ROWS: int = Field(10)
     MAX_FILE_SIZE_MB: int = Field(20)
     
     # PyCaret Configuration
@@ -55,6 +65,64 @@ class Settings(BaseSettings):
         ]
     )
     
+    # Training Executor Configuration
+    TRAINING_MAX_WORKERS: int = Field(2)
+    TRAINING_START_METHOD: str = Field("forkserver")
+    WORKER_PRELOAD: bool = Field(True)
+    WORKER_WARMUP_FIT: bool = Field(True)
+    TRAINING_EXECUTOR: str = Field("process")
+    TRAINING_HARD_TIMEOUT_SECONDS: int = Field(1800)
+    EDA_MAX_WORKERS: int = Field(1)
+    PLOT_RENDER_MAX_WORKERS: int = Field(1)
+    TRAINING_DEDUPE_ENABLED: bool = Field(True)
+    PARALLEL_CANDIDATES: bool = Field(False)
+    CANDIDATE_MAX_WORKERS: int = Field(4)
+    
+    # Successive Halving Configuration
+    HALVING_MIN_SAMPLE_ROWS: int = Field(500)
+    HALVING_TOP_K: int = Field(2)
+    HALVING_FOLDS: int = Field(3)
+    
+    # Hyperparameter Tuning Configuration
+    TUNING_N_ITER: int = Field(10)
+    TUNING_MAX_ROUNDS: int = Field(5)
+    TUNING_PATIENCE: int = Field(2)
+    TUNING_TIME_BUDGET_SECONDS: int = Field(120)
+    
+    # Ensemble Configuration
+    ENSEMBLE_TOP_N: int = Field(3)
+    
+    # Prediction Configuration
+    MAX_BATCH_PREDICTION_ROWS: int = Field(10000)
+    PREDICT_CSV_CHUNK_ROWS: int = Field(5000)
+    PREDICT_BATCHING_ENABLED: bool = Field(True)
+    PREDICT_BATCH_WINDOW_MS: float = Field(3.0)
+    PREDICT_MAX_BATCH_ROWS: int = Field(64)
+    INFERENCE_MAX_WORKERS: int = Field(4)
+    INFERENCE_PER_MODEL_CONCURRENCY: int = Field(2)
+    MAX_SCORING_FILE_SIZE_MB: int = Field(1024)
+    
+    # Model Cache Configuration
+    MODEL_CACHE_ENABLED: bool = Field(True)
+    MODEL_CACHE_MAX_MB: int = Field(256)
+    
+    # Experiment Cache Configuration
+    EXPERIMENT_CACHE_ENABLED: bool = Field(True)
+    EXPERIMENT_CACHE_MAX_MB: int = Field(512)
+    
+    # Evaluation Plot Configuration
+    EAGER_PLOTS: bool = Field(False)
+    PARALLEL_PLOTS: bool = Field(True)
+    PLOT_MAX_WORKERS: int = Field(3)
+    
+    # Admission Control Configuration
+    ADMISSION_MEMORY_BUDGET_MB: int = Field(1536)
+    ADMISSION_PER_USER_JOBS: int = Field(2)
+    ADMISSION_QUEUE_SIZE: int = Field(20)
+    ADMISSION_JOB_BASE_MB: int = Field(200)
+    ADMISSION_TRAIN_MEMORY_FACTOR: float = Field(10.0)
+    ADMISSION_EDA_MEMORY_FACTOR: float = Field(6.0)
+    
     # File Cleanup Configuration
     FILE_RETENTION_HOURS: int = Field(24)
     
@@ -79,7 +147,7 @@ class Settings(BaseSettings):
     
     def create_directories(self) -> None:
         """Create storage directories if they don't exist."""
-        for directory in [self.storage_dir, self.models_dir, self.plots_dir, self.eda_reports_dir]:
+        for directory in [self.storage_dir, self.models_dir, self.plots_dir, self.eda_reports_dir, self.snapshots_dir]:
             directory.mkdir(parents=True, exist_ok=True)
 
     class Config:
@@ -58,6 +58,7 @@ class EDAJob(BaseModel):
     dataset_rows: int = Field(..., description="Number of rows in dataset")
     dataset_columns: int = Field(..., description="Number of columns in dataset")
     file_size: int = Field(..., description="File size in bytes")
+    dataset_sha256: Optional[str] = Field(None, description="Hash of the uploaded dataset file")
     status: str = Field(default="completed", description="Job status")
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     
@@ -76,15 +77,50 @@ class ModelJob(BaseModel):
     dataset_name: str = Field(..., description="Original dataset name")
     target_column: str = Field(..., description="Target column for training")
     model_type: str = Field(..., description="Type of ML problem (classification/regression)")
-    best_model: str = Field(..., description="Best performing model name")
-    best_model_score: float = Field(..., description="Best model performance score")
+    best_model: Optional[str] = Field(None, description="Best performing model name")
+    best_model_id: Optional[str] = Field(None, description="PyCaret identifier of the best model")
+    best_model_score: Optional[float] = Field(None, description="Best model performance score")
     metrics: Dict[str, Any] = Field(default_factory=dict, description="Model evaluation metrics")
+    leaderboard: List[Dict[str, Any]] = Field(default_factory=list, description="CV metrics and fit time of every candidate")
+    candidate_filenames: Dict[str, str] = Field(default_factory=dict, description="Kept runner-up model files by model id")
+    tuning: Optional[Dict[str, Any]] = Field(None, description="Rounds and CV scores of hyperparameter tuning")
+    ensemble: Optional[Dict[str, Any]] = Field(None, description="Method, members and out-of-fold CV score of the kept ensemble, or why it was skipped")
     plot_filenames: List[str] = Field(default_factory=list, description="Generated plot filenames")
+    plot_files: Dict[str, str] = Field(default_factory=dict, description="Rendered plot filenames by plot type")
     feature_names: List[str] = Field(None, description="Feature names used in training")
     dataset_rows: int = Field(..., description="Number of rows in dataset")
     dataset_columns: int = Field(..., description="Number of columns in dataset")
+    dataset_sha256: Optional[str] = Field(None, description="Hash of the uploaded dataset file")
     training_time: Optional[float] = Field(None, description="Training time in seconds")
-    status: str = Field(default="completed", description="Job status")
+    status: str = Field(default="completed", description="Job status (queued/pending/running/completed/failed/cancelled)")
+    progress: float = Field(default=1.0, description="Job progress between 0 and 1")
+    error: Optional[str] = Field(None, description="Error message if the job failed")
+    events: List[Dict[str, Any]] = Field(default_factory=list, description="Training stage events with elapsed time")
+    fingerprint: Optional[str] = Field(None, description="Hash of the dataset and training settings")
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    
+    class Config:
+        allow_population_by_field_name = True
+        arbitrary_types_allowed = True
+        json_encoders = {ObjectId: str}
+
+
+class DatasetProfile(BaseModel):
+    """Column facts of an uploaded dataset, computed once and shared by training, EDA and prediction."""
+    
+    id: Optional[PyObjectId] = Field(default_factory=PyObjectId, alias="_id")
+    dataset_sha256: str = Field(..., description="Hash of the uploaded dataset file")
+    rows: int = Field(..., description="Number of rows in the (sampled) dataset")
+    columns: int = Field(..., description="Number of columns in the dataset")
+    column_profiles: Dict[str, Dict[str, Any]] = Field(
+        default_factory=dict,
+        description="Dtype, null count, cardinality and numeric min/max by column"
+    )
+    target_stats: Dict[str, Dict[str, Any]] = Field(
+        default_factory=dict,
+        description="Distribution of each column used as a training target"
+    )
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     
     class Config:
@@ -110,6 +146,21 @@ class Prediction(BaseModel):
         json_encoders = {ObjectId: str}
 
 
+class BatchPrediction(BaseModel):
+    """Batch prediction document model, recording the call but not its rows."""
+    
+    id: Optional[PyObjectId] = Field(default_factory=PyObjectId, alias="_id")
+    user_id: str = Field(..., description="User who made the prediction")
+    model_filename: str = Field(..., description="Model used for prediction")
+    batch_rows: int = Field(..., description="Number of rows scored")
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    
+    class Config:
+        allow_population_by_field_name = True
+        arbitrary_types_allowed = True
+        json_encoders = {ObjectId: str}
+
+
 class CleanupLog(BaseModel):
     """Cleanup operation log document model."""
     
@@ -58,6 +58,10 @@ class MongoDB:
             # Model jobs collection indexes
             await self.database.model_jobs.create_index([("user_id", 1), ("created_at", -1)])
             await self.database.model_jobs.create_index("filename", unique=True)
+            await self.database.model_jobs.create_index([("fingerprint", 1), ("status", 1)])
+            
+            # Dataset profiles collection indexes
+            await self.database.dataset_profiles.create_index("dataset_sha256", unique=True)
             
             # Predictions collection indexes
             await self.database.predictions.create_index([("user_id", 1), ("created_at", -1)])
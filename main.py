@@ -2,10 +2,11 @@
 FastAPI entrypoint for AutoML platform.
 """
 
+import asyncio
 import logging
 from contextlib import asynccontextmanager
 
-from typing import Dict
+from typing import Dict, Any, Optional
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
@@ -13,7 +14,12 @@ from fastapi.staticfiles import StaticFiles
 from config import settings
 from db.mongodb import mongodb
 from routes import train, eda, models, cleanup
+from services.admission import admission_controller
 from services.cleanup_service import CleanupService
+from services.inference_pool import inference_pool
+from services.job_tracker import job_tracker
+from services.train_service import TrainService
+from services.worker_pool import training_pool, eda_pool, plot_pool
 from schemas.response_schemas import HealthResponse
 
 # Configure logging
@@ -24,6 +30,13 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+async def warm_up_workers() -> None:
+    """Warm up the training, EDA and plot workers, which share one preloaded fork server."""
+    await training_pool.warm_up()
+    await eda_pool.warm_up()
+    await plot_pool.warm_up()
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan manager for startup and shutdown events."""
@@ -40,9 +53,15 @@ async def lifespan(app: FastAPI):
         cleanup_result = await cleanup_service.cleanup_old_files()
         logger.info(f"Startup cleanup completed: {cleanup_result}")
         
+        # Jobs of an earlier run still marked as in progress will never finish
+        await TrainService().fail_interrupted_jobs()
+        
         # Ensure storage directories exist
         logger.info("Storage directories initialized")
         
+        # Load PyCaret into the workers in the background, so the first job does not pay for it
+        app.state.warm_up_task = asyncio.create_task(warm_up_workers())
+        
         logger.info("AutoML Platform API started successfully")
         
     except Exception as e:
@@ -55,6 +74,15 @@ async def lifespan(app: FastAPI):
     logger.info("Shutting down AutoML Platform API...")
     
     try:
+        # Stop any training still running in worker processes
+        app.state.warm_up_task.cancel()
+        training_pool.shutdown()
+        eda_pool.shutdown()
+        plot_pool.shutdown()
+        await job_tracker.shutdown()
+        inference_pool.shutdown()
+        logger.info("Training and inference workers stopped")
+        
         # Disconnect from MongoDB
         await mongodb.disconnect()
         logger.info("MongoDB connection closed")
@@ -103,6 +131,12 @@ async def root():
     }
 
 
+@app.get("/queue", response_model=Dict[str, Any])
+async def queue_status(user_id: Optional[str] = None):
+    """Memory use and admission queue of training and EDA jobs."""
+    return admission_controller.stats(user_id)
+
+
 @app.get("/health", response_model=HealthResponse)
 async def health_check():
     """Health check endpoint."""
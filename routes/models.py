@@ -8,7 +8,11 @@ from fastapi.responses import FileResponse
 from fastapi.encoders import jsonable_encoder
 from typing import List
 
+from services.inference_pool import inference_pool
+from services.model_cache import model_cache
+from services.prediction_batcher import prediction_batcher
 from services.model_service import ModelService
+from services.plot_service import PlotService
 from schemas.request_schemas import CompareModelsRequest
 from schemas.response_schemas import ModelListResponse, ModelListItem, BaseResponse
 
@@ -107,6 +111,47 @@ async def delete_model(filename: str):
         raise HTTPException(status_code=500, detail=f"Failed to delete model: {str(e)}")
 
 
+@router.post("/promote/{filename}")
+async def promote_candidate_model(filename: str, model_id: str):
+    """
+    Promote a kept runner-up model to be the served model, without retraining.
+    
+    - **filename**: Model filename of the training job
+    - **model_id**: PyCaret model id of the runner-up (e.g. `lr`, `rf`)
+    """
+    try:
+        model_service = ModelService()
+
+        promoted = await model_service.promote_candidate(filename, model_id)
+        
+        if not promoted:
+            raise HTTPException(status_code=404, detail="Model metadata not found")
+        
+        return jsonable_encoder({
+            "success": True,
+            "message": f"Promoted {promoted['best_model']} for model {filename}",
+            "model": promoted
+        })
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Failed to promote candidate {model_id} for model {filename}: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to promote model: {str(e)}")
+
+
+@router.get("/cache/stats")
+async def get_model_cache_stats():
+    """Hit and miss counts and size of the in-memory cache of loaded models, prediction batching and inference load."""
+    return {
+        "success": True,
+        "message": "Model cache statistics retrieved",
+        "cache": model_cache.stats(),
+        "batching": prediction_batcher.stats(),
+        "inference": inference_pool.stats()
+    }
+
+
 @router.get("/metrics/{filename}")
 async def get_model_metrics(filename: str):
     """
@@ -138,14 +183,16 @@ async def get_model_metrics(filename: str):
 @router.get("/plots/{filename}")
 async def get_model_plots(filename: str):
     """
-    Get all plot URLs associated with a specific model.
+    Get all evaluation plots of a specific model.
+    
+    Plots are rendered on first request and served from disk afterwards.
     
     - **filename**: Model filename
     """
     try:
-        model_service = ModelService()
+        plot_service = PlotService()
 
-        plots = await model_service.get_model_plots(filename)
+        plots = await plot_service.get_model_plots(filename)
         
         if not plots:
             raise HTTPException(status_code=404, detail="Model plots not found")
@@ -163,6 +210,33 @@ async def get_model_plots(filename: str):
         raise HTTPException(status_code=500, detail=f"Failed to get plots: {str(e)}")
 
 
+@router.get("/plots/{filename}/{plot_type}")
+async def get_model_plot(filename: str, plot_type: str):
+    """
+    Get one evaluation plot image of a specific model.
+    
+    The plot is rendered on first request and served from disk afterwards.
+    
+    - **filename**: Model filename
+    - **plot_type**: Plot type (e.g. `confusion_matrix`, `roc`, `residuals`)
+    """
+    try:
+        plot_service = PlotService()
+
+        plot_path = await plot_service.get_plot_path(filename, plot_type)
+        
+        if not plot_path or not plot_path.exists():
+            raise HTTPException(status_code=404, detail="Model plot not found")
+        
+        return FileResponse(path=str(plot_path), media_type='image/png')
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Failed to get {plot_type} plot for {filename}: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to get plot: {str(e)}")
+
+
 @router.post("/compare", response_model=None)
 async def compare_user_models(request: CompareModelsRequest):
     """
@@ -2,14 +2,25 @@
 Model training API routes.
 """
 
+import json
+import asyncio
 import logging
-from typing import Dict, Any
+from pathlib import Path
+from typing import Dict, Any, AsyncIterator
 from fastapi import APIRouter, UploadFile, File, Form, HTTPException, BackgroundTasks
 from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, StreamingResponse
 
+from config import settings
 from services.train_service import TrainService
-from schemas.request_schemas import ModelTrainRequest, PredictionRequest
-from schemas.response_schemas import ModelTrainResponse, PredictionResponse
+from schemas.request_schemas import ModelTrainRequest, PredictionRequest, BatchPredictionRequest
+from schemas.response_schemas import (
+    ModelTrainResponse,
+    ModelJobSubmitResponse,
+    ModelJobStatusResponse,
+    PredictionResponse,
+    BatchPredictionResponse
+)
 from utils.file_utils import FileManager
 
 logger = logging.getLogger(__name__)
@@ -23,7 +34,13 @@ async def train_model(
     user_id: str = Form(..., description="User identifier"),
     target_column: str = Form(..., description="Target column name"),
     dataset_name: str = Form(None, description="Optional dataset name"),
-    model_types: str = Form(None, description="Comma-separated model types")
+    model_types: str = Form(None, description="Comma-separated model types"),
+    time_budget_seconds: float = Form(None, description="Optional wall-clock budget for the model search"),
+    selection_strategy: str = Form("full", description="Model selection strategy: full or halving"),
+    keep_top_n: int = Form(0, description="Number of runner-up models to keep for promotion"),
+    tune: bool = Form(False, description="Tune the selected model within a fixed budget"),
+    ensemble: str = Form("none", description="Ensemble to build from the top candidates: none or top3"),
+    background: bool = Form(False, description="Return 202 with a job id instead of waiting")
 ):
     """
     Train ML model on uploaded dataset.
@@ -33,6 +50,12 @@ async def train_model(
     - **target_column**: Name of the target column for training
     - **dataset_name**: Optional custom name for the dataset
     - **model_types**: Optional comma-separated list of specific models to train
+    - **time_budget_seconds**: Optional budget; remaining candidates are skipped once it is spent
+    - **selection_strategy**: `full` cross-validates every candidate, `halving` races them on growing subsamples first
+    - **keep_top_n**: Keep this many finalized runners-up so they can be promoted later
+    - **tune**: If True, tune the selected model in bounded rounds and keep it only if CV improves
+    - **ensemble**: `top3` blends or stacks the top three candidates and keeps the ensemble for promotion
+    - **background**: If True, return 202 with a job id and poll `/model/jobs/{job_id}`
     """
     try:
         # Validate file
@@ -50,12 +73,37 @@ async def train_model(
             user_id=user_id,
             target_column=target_column,
             dataset_name=dataset_name or file.filename,
-            model_types=parsed_model_types
+            model_types=parsed_model_types,
+            time_budget_seconds=time_budget_seconds,
+            selection_strategy=selection_strategy,
+            keep_top_n=keep_top_n,
+            tune=tune,
+            ensemble=ensemble
         )
         
         # Initialize training service
         train_service = TrainService()
         
+        # Submit-and-poll mode: hand back the job id right away
+        if background:
+            job = await train_service.submit_training(file, train_request)
+            
+            logger.info(f"Model training job {job['job_id']} accepted for user {user_id}")
+            
+            return JSONResponse(
+                status_code=202,
+                content=jsonable_encoder(ModelJobSubmitResponse(
+                    success=True,
+                    message="Reused an identical training job" if job["reused"] else "Model training job accepted",
+                    job_id=job["job_id"],
+                    status=job["status"],
+                    filename=job["filename"],
+                    status_url=job["status_url"],
+                    reused=job["reused"],
+                    queue_position=job["queue_position"]
+                ))
+            )
+        
         # Start training process
         result = await train_service.train_model(file, train_request)
         
@@ -74,7 +122,10 @@ async def train_model(
             best_model_score=result["best_model_score"],
             metrics=result["metrics"],
             plot_urls=result["plot_urls"],
-            training_time=result["training_time"]
+            training_time=result["training_time"],
+            leaderboard=result["leaderboard"],
+            tuning=result["tuning"],
+            ensemble=result["ensemble"]
         ))
         
     except HTTPException:
@@ -84,6 +135,121 @@ async def train_model(
         raise HTTPException(status_code=500, detail=f"Training failed: {str(e)}")
 
 
+@router.get("/jobs/{job_id}", response_model=ModelJobStatusResponse)
+async def get_training_job(job_id: str):
+    """
+    Get status, progress and result of a training job.
+    
+    - **job_id**: Training job identifier returned by `/model/train`
+    """
+    try:
+        train_service = TrainService()
+        
+        job = await train_service.get_job_status(job_id)
+        
+        if not job:
+            raise HTTPException(status_code=404, detail="Training job not found")
+        
+        return jsonable_encoder(ModelJobStatusResponse(
+            success=True,
+            message=f"Training job is {job['status']}",
+            job_id=job["job_id"],
+            status=job["status"],
+            progress=job["progress"],
+            stage=job["stage"],
+            queue_position=job["queue_position"],
+            filename=job["filename"],
+            error=job["error"],
+            result=job["result"]
+        ))
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Failed to get training job {job_id}: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to get job: {str(e)}")
+
+
+@router.delete("/jobs/{job_id}")
+async def cancel_training_job(job_id: str):
+    """
+    Cancel a pending or running training job and kill its worker process.
+    
+    - **job_id**: Training job identifier returned by `/model/train`
+    """
+    try:
+        train_service = TrainService()
+        
+        job = await train_service.cancel_job(job_id)
+        
+        if not job:
+            raise HTTPException(status_code=404, detail="Training job not found")
+        
+        return jsonable_encoder({
+            "success": True,
+            "message": f"Training job {job_id} cancelled",
+            "job_id": job["job_id"],
+            "status": job["status"]
+        })
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Failed to cancel training job {job_id}: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to cancel job: {str(e)}")
+
+
+@router.get("/jobs/{job_id}/events")
+async def stream_training_job_events(job_id: str):
+    """
+    Stream training stage events as Server-Sent Events.
+    
+    Each event carries the stage name, progress and elapsed seconds since
+    the upload. The stream ends with a `completed` or `failed` event.
+    
+    - **job_id**: Training job identifier returned by `/model/train`
+    """
+    try:
+        train_service = TrainService()
+        
+        events = await train_service.stream_job_events(job_id)
+        
+        if events is None:
+            raise HTTPException(status_code=404, detail="Training job not found")
+        
+        return StreamingResponse(
+            _format_sse(events),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Failed to stream events for training job {job_id}: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to stream events: {str(e)}")
+
+
+async def _format_sse(events: AsyncIterator[Dict[str, Any]], keepalive: float = 15.0) -> AsyncIterator[str]:
+    """Format job events as an SSE stream with periodic keep-alive comments."""
+    iterator = events.__aiter__()
+    next_event = asyncio.ensure_future(iterator.__anext__())
+    try:
+        while True:
+            done, _ = await asyncio.wait({next_event}, timeout=keepalive)
+            if not done:
+                yield ": keep-alive\n\n"
+                continue
+            try:
+                event = next_event.result()
+            except StopAsyncIteration:
+                return
+            yield f"event: {event['stage']}\ndata: {json.dumps(jsonable_encoder(event))}\n\n"
+            next_event = asyncio.ensure_future(iterator.__anext__())
+    finally:
+        next_event.cancel()
+
+
 @router.post("/predict")
 async def make_prediction(request: Dict[str, Any]):
     """
@@ -120,4 +286,75 @@ async def make_prediction(request: Dict[str, Any]):
         raise HTTPException(status_code=500, detail=f"Prediction failed: {str(e)}")
 
 
+@router.post("/predict/batch")
+async def make_batch_prediction(request: BatchPredictionRequest):
+    """
+    Score many records with one call through the model pipeline.
+    
+    - **user_id**: User identifier
+    - **model_filename**: Filename of the trained model
+    - **records**: List of input rows, each a dictionary of features
+    - **columns**: Alternatively, a dictionary of equally long feature arrays
+    """
+    try:
+        train_service = TrainService()
+        
+        result = await train_service.predict_batch(request)
+        
+        return jsonable_encoder(BatchPredictionResponse(
+            success=True,
+            message=f"Scored {result['rows']} rows",
+            predictions=result["predictions"],
+            prediction_probabilities=result["prediction_probabilities"],
+            model_used=result["model_filename"],
+            rows=result["rows"]
+        ))
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Batch prediction failed: {e}")
+        raise HTTPException(status_code=500, detail=f"Batch prediction failed: {str(e)}")
+
 
+@router.post("/predict/csv")
+async def score_csv(
+    file: UploadFile = File(..., description="CSV file of rows to score"),
+    user_id: str = Form(..., description="User identifier"),
+    model_filename: str = Form(..., description="Filename of the trained model")
+):
+    """
+    Score a CSV file of any size, streaming it back with predictions appended.
+    
+    - **file**: CSV file with the model's feature columns
+    - **user_id**: User identifier
+    - **model_filename**: Filename of the trained model
+    
+    The response is the input CSV with a `prediction` column and, for
+    classifiers, one `probability_<i>` column per class in the order of
+    `/model/predict` probabilities. Rows are read and scored in chunks.
+    """
+    try:
+        if not file.filename.lower().endswith('.csv'):
+            raise HTTPException(status_code=400, detail="File must be a CSV file")
+        if file.size and file.size > settings.MAX_SCORING_FILE_SIZE_MB * 1024 * 1024:
+            raise HTTPException(
+                status_code=413,
+                detail=f"File too large. Max size: {settings.MAX_SCORING_FILE_SIZE_MB}MB"
+            )
+        
+        train_service = TrainService()
+        
+        stream = await train_service.score_csv(file, user_id, model_filename)
+        
+        return StreamingResponse(
+            stream,
+            media_type="text/csv",
+            headers={"Content-Disposition": f'attachment; filename="scored_{Path(file.filename).name}"'}
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"CSV scoring failed: {e}")
+        raise HTTPException(status_code=500, detail=f"CSV scoring failed: {str(e)}")
@@ -3,7 +3,7 @@ Pydantic request schemas for API endpoints.
 """
 
 from typing import Optional, List, Dict, Any
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, field_validator, model_validator
 
 class EDAGenerateRequest(BaseModel):
     """Request schema for EDA report generation."""
@@ -26,6 +26,11 @@ class ModelTrainRequest(BaseModel):
     target_column: str = Field(..., description="Target column name for training")
     dataset_name: Optional[str] = Field(None, description="Optional dataset name")
     model_types: Optional[List[str]] = Field(None, description="Specific models to train")
+    time_budget_seconds: Optional[float] = Field(None, description="Wall-clock budget for the candidate search")
+    selection_strategy: str = Field("full", description="Model selection strategy (full/halving)")
+    keep_top_n: int = Field(0, description="Number of runner-up models to keep for promotion")
+    tune: bool = Field(False, description="Run budgeted hyperparameter tuning on the selected model")
+    ensemble: str = Field("none", description="Ensemble of top candidates to build (none/top3)")
     
     @field_validator('user_id')
     @classmethod
@@ -50,6 +55,36 @@ class ModelTrainRequest(BaseModel):
                 if model not in allowed_models:
                     raise ValueError(f'Invalid model type: {model}. Allowed: {allowed_models}')
         return v
+    
+    @field_validator('time_budget_seconds')
+    @classmethod
+    def validate_time_budget_seconds(cls, v):
+        if v is not None and v <= 0:
+            raise ValueError('time_budget_seconds must be positive')
+        return v
+    
+    @field_validator('selection_strategy')
+    @classmethod
+    def validate_selection_strategy(cls, v):
+        allowed_strategies = ['full', 'halving']
+        if v not in allowed_strategies:
+            raise ValueError(f'Invalid selection strategy: {v}. Allowed: {allowed_strategies}')
+        return v
+    
+    @field_validator('ensemble')
+    @classmethod
+    def validate_ensemble(cls, v):
+        allowed_ensembles = ['none', 'top3']
+        if v not in allowed_ensembles:
+            raise ValueError(f'Invalid ensemble: {v}. Allowed: {allowed_ensembles}')
+        return v
+    
+    @field_validator('keep_top_n')
+    @classmethod
+    def validate_keep_top_n(cls, v):
+        if v < 0 or v > 6:
+            raise ValueError('keep_top_n must be between 0 and 6')
+        return v
 
 
 class PredictionRequest(BaseModel):
@@ -83,6 +118,45 @@ class PredictionRequest(BaseModel):
         return v
 
 
+class BatchPredictionRequest(BaseModel):
+    """Request schema for scoring many records in one call."""
+    
+    user_id: str = Field(..., description="User identifier")
+    model_filename: str = Field(..., description="Model filename to use for prediction")
+    records: Optional[List[Dict[str, Any]]] = Field(None, description="Input rows, one dictionary of features per row")
+    columns: Optional[Dict[str, List[Any]]] = Field(None, description="Input columns, one array of values per feature")
+    
+    @field_validator('user_id')
+    @classmethod
+    def validate_user_id(cls, v):
+        if not v or len(v.strip()) == 0:
+            raise ValueError('user_id cannot be empty')
+        return v.strip()
+    
+    @field_validator('model_filename')
+    @classmethod
+    def validate_model_filename(cls, v):
+        if not v or len(v.strip()) == 0:
+            raise ValueError('model_filename cannot be empty')
+        if not v.endswith('.pkl'):
+            raise ValueError('model_filename must end with .pkl')
+        return v.strip()
+    
+    @model_validator(mode='after')
+    def validate_input(self):
+        if (self.records is None) == (self.columns is None):
+            raise ValueError('Provide exactly one of records or columns')
+        if self.records is not None and len(self.records) == 0:
+            raise ValueError('records cannot be empty')
+        if self.columns is not None:
+            lengths = {len(values) for values in self.columns.values()}
+            if not self.columns or lengths == {0}:
+                raise ValueError('columns cannot be empty')
+            if len(lengths) > 1:
+                raise ValueError('All column arrays must have the same length')
+        return self
+
+
 class CleanupUserRequest(BaseModel):
     """Request schema for user cleanup operations."""
     
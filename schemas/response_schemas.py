@@ -39,6 +39,33 @@ class ModelTrainResponse(BaseResponse):
     metrics: Dict[str, Any] = Field(..., description="Detailed model metrics")
     plot_urls: List[str] = Field(..., description="URLs to evaluation plots")
     training_time: float = Field(..., description="Training time in seconds")
+    leaderboard: List[Dict[str, Any]] = Field(default_factory=list, description="CV metrics and fit time of every candidate")
+    tuning: Optional[Dict[str, Any]] = Field(None, description="Rounds and CV scores of hyperparameter tuning, if requested")
+    ensemble: Optional[Dict[str, Any]] = Field(None, description="Method, members and out-of-fold CV score of the ensemble, or why it was skipped, if requested")
+
+
+class ModelJobSubmitResponse(BaseResponse):
+    """Response schema for a training job submitted in the background."""
+    
+    job_id: str = Field(..., description="Training job identifier")
+    status: str = Field(..., description="Job status")
+    filename: str = Field(..., description="Model filename the job will produce")
+    status_url: str = Field(..., description="URL to poll for job status")
+    reused: bool = Field(False, description="True if an identical completed or running job was reused")
+    queue_position: Optional[int] = Field(None, description="Position in the admission queue if the job is waiting")
+
+
+class ModelJobStatusResponse(BaseResponse):
+    """Response schema for training job status."""
+    
+    job_id: str = Field(..., description="Training job identifier")
+    status: str = Field(..., description="Job status (queued/pending/running/completed/failed/cancelled)")
+    progress: float = Field(..., description="Job progress between 0 and 1")
+    stage: Optional[str] = Field(None, description="Most recent training stage")
+    queue_position: Optional[int] = Field(None, description="Position in the admission queue if the job is waiting")
+    filename: str = Field(..., description="Model filename produced by the job")
+    error: Optional[str] = Field(None, description="Error message if the job failed")
+    result: Optional[Dict[str, Any]] = Field(None, description="Training result once completed")
 
 
 class PredictionResponse(BaseResponse):
@@ -50,6 +77,15 @@ class PredictionResponse(BaseResponse):
     input_features: Dict[str, Any] = Field(..., description="Input features used")
 
 
+class BatchPredictionResponse(BaseResponse):
+    """Response schema for batch predictions."""
+    
+    predictions: List[Any] = Field(..., description="Model predictions, one per input row")
+    prediction_probabilities: Optional[List[List[float]]] = Field(None, description="Prediction probabilities, one list per input row")
+    model_used: str = Field(..., description="Model filename used")
+    rows: int = Field(..., description="Number of rows scored")
+
+
 class ModelListItem(BaseModel):
     """Model list item schema."""
     
@@ -0,0 +1,155 @@
+"""
+Memory-aware admission control for training and EDA jobs.
+"""
+
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+from fastapi import HTTPException
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+MB = 1024 * 1024
+
+
+class AdmissionController:
+    """
+    Admits jobs against a global memory budget and a per-user concurrency cap.
+
+    Jobs that cannot start yet wait in a FIFO queue. A job that needs more
+    memory than is free blocks the jobs behind it, so large datasets are not
+    starved by a stream of small ones; a job held back only by its user's cap
+    lets other users' jobs pass.
+    """
+
+    def __init__(self, memory_budget_mb: int, per_user_jobs: int, queue_size: int):
+        self.memory_budget = memory_budget_mb * MB
+        self.per_user_jobs = per_user_jobs
+        self.queue_size = queue_size
+        self._tickets: Dict[str, Dict[str, Any]] = {}
+        self._queue: List[str] = []
+        self._memory_in_use = 0
+
+    @staticmethod
+    def estimate_memory(df: pd.DataFrame, factor: float) -> int:
+        """Estimate the peak memory of a job from the in-memory size of its dataset."""
+        # deep=True counts the actual size of object (string) columns
+        dataset_bytes = int(df.memory_usage(index=True, deep=True).sum())
+        return int(dataset_bytes * factor) + settings.ADMISSION_JOB_BASE_MB * MB
+
+    def enqueue(self, ticket_id: str, user_id: str, kind: str, memory_bytes: int) -> Optional[int]:
+        """
+        Register a job for admission.
+
+        Returns None if the job was admitted right away, otherwise its
+        1-based queue position. Raises 429 if the queue is full.
+        """
+        self._tickets[ticket_id] = {
+            "ticket_id": ticket_id,
+            "user_id": user_id,
+            "kind": kind,
+            "memory": memory_bytes,
+            "state": "queued",
+            "admitted": asyncio.get_running_loop().create_future()
+        }
+        self._queue.append(ticket_id)
+        self._admit_waiting()
+
+        position = self.position(ticket_id)
+        if position is not None and position > self.queue_size:
+            self.release(ticket_id)
+            raise HTTPException(
+                status_code=429,
+                detail="Server is at capacity and the job queue is full, please retry later"
+            )
+
+        if position is not None:
+            logger.info(
+                f"Queued {kind} job {ticket_id} for user {user_id} at position {position} "
+                f"({memory_bytes / MB:.0f} MB estimated)"
+            )
+        return position
+
+    async def wait(self, ticket_id: str) -> None:
+        """Wait until a registered job is admitted."""
+        ticket = self._tickets.get(ticket_id)
+        if ticket is None:
+            raise KeyError(f"Job {ticket_id} is not registered for admission")
+
+        try:
+            await ticket["admitted"]
+        except asyncio.CancelledError:
+            self.release(ticket_id)
+            raise
+
+    def release(self, ticket_id: str) -> None:
+        """Release the memory of a finished job, or drop it from the queue."""
+        ticket = self._tickets.pop(ticket_id, None)
+        if ticket is None:
+            return
+
+        if ticket["state"] == "running":
+            self._memory_in_use -= ticket["memory"]
+        elif ticket_id in self._queue:
+            self._queue.remove(ticket_id)
+
+        self._admit_waiting()
+
+    def position(self, ticket_id: str) -> Optional[int]:
+        """Get the 1-based queue position of a waiting job."""
+        if ticket_id not in self._queue:
+            return None
+        return self._queue.index(ticket_id) + 1
+
+    def stats(self, user_id: Optional[str] = None) -> Dict[str, Any]:
+        """Get memory use and queue state, listing only the given user's queued jobs if set."""
+        running = [t for t in self._tickets.values() if t["state"] == "running"]
+        queued = [
+            {"ticket_id": ticket_id, "kind": self._tickets[ticket_id]["kind"], "position": position}
+            for position, ticket_id in enumerate(self._queue, start=1)
+            if user_id is None or self._tickets[ticket_id]["user_id"] == user_id
+        ]
+
+        return {
+            "memory_budget_mb": round(self.memory_budget / MB, 1),
+            "memory_in_use_mb": round(self._memory_in_use / MB, 1),
+            "running_jobs": len(running),
+            "queued_jobs": len(self._queue),
+            "queue": queued
+        }
+
+    def _running_for_user(self, user_id: str) -> int:
+        return sum(
+            1 for t in self._tickets.values()
+            if t["state"] == "running" and t["user_id"] == user_id
+        )
+
+    def _admit_waiting(self) -> None:
+        """Admit queued jobs in arrival order while memory allows."""
+        for ticket_id in list(self._queue):
+            ticket = self._tickets[ticket_id]
+
+            if self._running_for_user(ticket["user_id"]) >= self.per_user_jobs:
+                continue
+
+            # A job bigger than the whole budget still runs, but only on its own
+            if self._memory_in_use and self._memory_in_use + ticket["memory"] > self.memory_budget:
+                break
+
+            self._queue.remove(ticket_id)
+            ticket["state"] = "running"
+            self._memory_in_use += ticket["memory"]
+            if not ticket["admitted"].done():
+                ticket["admitted"].set_result(None)
+
+
+# Global admission controller instance
+admission_controller = AdmissionController(
+    settings.ADMISSION_MEMORY_BUDGET_MB,
+    settings.ADMISSION_PER_USER_JOBS,
+    settings.ADMISSION_QUEUE_SIZE
+)
@@ -9,6 +9,7 @@ from pathlib import Path
 
 from config import settings
 from db.mongodb import mongodb
+from services.model_cache import model_cache
 from utils.file_utils import FileManager
 from schemas.request_schemas import CleanupUserRequest
 from db.models import CleanupLog
@@ -40,6 +41,7 @@ class CleanupService:
             # Find and delete user files from all directories
             directories = [
                 settings.models_dir,
+                settings.snapshots_dir,
                 settings.eda_reports_dir
             ]
             
@@ -50,6 +52,8 @@ class CleanupService:
                     if FileManager.delete_file(file_path):
                         files_deleted.append(str(file_path))
                         logger.info(f"Deleted user file: {file_path}")
+                        if directory == settings.models_dir:
+                            model_cache.invalidate(file_path.name)
 
             db = mongodb
             
@@ -106,6 +110,7 @@ class CleanupService:
             # Find old files in all directories
             directories = [
                 settings.models_dir,
+                settings.snapshots_dir,
                 settings.eda_reports_dir
             ]
             
@@ -117,6 +122,8 @@ class CleanupService:
                         if FileManager.delete_file(file_path):
                             files_deleted.append(str(file_path))
                             logger.info(f"Deleted old file: {file_path}")
+                            if directory == settings.models_dir:
+                                model_cache.invalidate(file_path.name)
                     else:
                         files_deleted.append(str(file_path))
             
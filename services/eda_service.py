@@ -3,6 +3,7 @@ EDA service for generating and managing EDA reports using Pandas Profiling.
 """
 
 import logging
+import pandas as pd
 from pathlib import Path
 from typing import List, Dict, Any, Optional
 from pandas_profiling import ProfileReport
@@ -10,6 +11,9 @@ from fastapi import UploadFile, HTTPException
 
 from config import settings
 from db.mongodb import mongodb
+from services.admission import admission_controller
+from services.profile_service import ProfileService
+from services.worker_pool import eda_pool
 from db.models import EDAJob
 from schemas.request_schemas import EDAGenerateRequest
 from utils.file_utils import FileManager
@@ -43,21 +47,35 @@ class EDAService:
             
             try:
                 # Save uploaded file temporarily
-                await FileManager.save_uploaded_file(file, temp_path)
+                file_info = await FileManager.save_uploaded_file(file, temp_path)
                 
                 # Read CSV data
                 df = await FileManager.read_csv_file(temp_path)
                 
-                # Generate profile report
-                profile = ProfileReport(
-                    df,
-                    title=f"EDA Report - {request.dataset_name or file.filename}",
-                    explorative=True,
-                    minimal=False
-                )
+                # Shared column facts of the upload, reused if the same file was profiled before
+                profile = await ProfileService().get_or_create(df, file_info["sha256"])
                 
-                # Save report as HTML
-                profile.to_file(report_path)
+                # Wait for memory and the user's job slots, rejecting with 429 when the queue is full
+                admission_controller.enqueue(
+                    report_filename,
+                    request.user_id,
+                    "eda",
+                    admission_controller.estimate_memory(df, settings.ADMISSION_EDA_MEMORY_FACTOR)
+                )
+                try:
+                    await admission_controller.wait(report_filename)
+                    
+                    # Generate the report in a pre-warmed EDA worker, off the event loop
+                    await eda_pool.run(
+                        render_report,
+                        df,
+                        f"EDA Report - {request.dataset_name or file.filename}",
+                        str(report_path),
+                        job_id=report_filename,
+                        timeout=settings.TRAINING_HARD_TIMEOUT_SECONDS
+                    )
+                finally:
+                    admission_controller.release(report_filename)
                 
                 # Get file size
                 file_size = report_path.stat().st_size
@@ -67,8 +85,9 @@ class EDAService:
                     user_id=request.user_id,
                     filename=report_filename,
                     dataset_name=request.dataset_name or file.filename,
-                    dataset_rows=len(df),
-                    dataset_columns=len(df.columns),
+                    dataset_rows=profile["rows"],
+                    dataset_columns=profile["columns"],
+                    dataset_sha256=file_info["sha256"],
                     file_size=file_size,
                     status="completed"
                 )
@@ -82,8 +101,8 @@ class EDAService:
                     "filename": report_filename,
                     "report_url": f"/eda/view/{report_filename}",
                     "dataset_name": request.dataset_name or file.filename,
-                    "dataset_rows": len(df),
-                    "dataset_columns": len(df.columns),
+                    "dataset_rows": profile["rows"],
+                    "dataset_columns": profile["columns"],
                     "file_size": file_size
                 }
                 
@@ -92,6 +111,8 @@ class EDAService:
                 if temp_path.exists():
                     FileManager.delete_file(temp_path)
                     
+        except HTTPException:
+            raise
         except Exception as e:
             logger.error(f"Failed to generate EDA report: {e}")
             raise HTTPException(status_code=500, detail=f"EDA generation failed: {str(e)}")
@@ -193,5 +214,17 @@ class EDAService:
         except Exception as e:
             logger.error(f"Failed to delete EDA report {filename}: {e}")
             return False
+
+
+def render_report(df: pd.DataFrame, title: str, report_path: str) -> None:
+    """Entry point for EDA report worker processes."""
+    # Generate profile report
+    profile = ProfileReport(
+        df,
+        title=title,
+        explorative=True,
+        minimal=False
+    )
     
-    
\ No newline at end of file
+    # Save report as HTML
+    profile.to_file(report_path)
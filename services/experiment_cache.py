@@ -0,0 +1,157 @@
+"""
+Disk-backed LRU cache for prepared PyCaret experiments and candidate results.
+"""
+
+import os
+import json
+import hashlib
+import logging
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import cloudpickle
+import pandas as pd
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+# Experiment attributes PyCaret drops when pickling (_attributes_to_not_save)
+EXPERIMENT_DATA_ATTRIBUTES = ("data", "test_data", "data_func")
+
+
+class ExperimentCache:
+    """
+    Stores pickled objects on disk, evicting the least recently used once the
+    total size exceeds the budget.
+
+    Training runs in a fresh worker process per job, so the cache lives on disk
+    where every worker can read it; entries are written atomically so workers
+    can share it safely.
+    """
+
+    def __init__(self, cache_dir: Path, max_bytes: int, enabled: bool = True):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+
+    @staticmethod
+    def dataset_hash(df: pd.DataFrame) -> str:
+        """Hash a dataset by content, column names and dtypes."""
+        digest = hashlib.sha256()
+        digest.update(pd.util.hash_pandas_object(df, index=True).values.tobytes())
+        digest.update(json.dumps([[str(c), str(t)] for c, t in df.dtypes.items()]).encode())
+        return digest.hexdigest()
+
+    @staticmethod
+    def make_key(kind: str, **parts) -> str:
+        """Build a cache key of a kind from the values that determine the entry."""
+        payload = json.dumps(parts, sort_keys=True, default=str)
+        return f"{kind}_{hashlib.sha256(payload.encode()).hexdigest()[:32]}"
+
+    def get(self, key: str) -> Optional[Any]:
+        """Load an entry, marking it as recently used."""
+        if not self.enabled:
+            return None
+
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                value = cloudpickle.load(f)
+            os.utime(path)
+            return value
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Discarding unreadable cache entry {key}: {e}")
+            path.unlink(missing_ok=True)
+            return None
+
+    def put(self, key: str, value: Any) -> None:
+        """Store an entry and evict the least recently used entries over the budget."""
+        if not self.enabled:
+            return
+
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, 'wb') as f:
+                cloudpickle.dump(value, f)
+            os.replace(temp_path, self._path(key))
+        except Exception as e:
+            logger.warning(f"Failed to cache {key}: {e}")
+            if 'temp_path' in locals():
+                Path(temp_path).unlink(missing_ok=True)
+            return
+
+        self._evict()
+
+    def get_experiment(self, key: str) -> Optional[Any]:
+        """Load a prepared PyCaret experiment with its dataset reattached."""
+        return self.unpack_experiment(self.get(key))
+
+    def put_experiment(self, key: str, experiment: Any) -> None:
+        """Store a prepared PyCaret experiment together with its dataset."""
+        self.put(key, self.pack_experiment(experiment))
+
+    @staticmethod
+    def pack_experiment(experiment: Any) -> Dict[str, Any]:
+        """
+        Bundle a prepared PyCaret experiment with its dataset for pickling.
+
+        PyCaret leaves its dataset out when an experiment is pickled, and the
+        train/holdout splits and everything fitted on them are read from it,
+        so the dataset is kept next to the experiment.
+        """
+        data = {name: getattr(experiment, name, None) for name in EXPERIMENT_DATA_ATTRIBUTES}
+        return {"experiment": experiment, "data": data}
+
+    @staticmethod
+    def unpack_experiment(entry: Any) -> Optional[Any]:
+        """Restore an experiment bundled by pack_experiment, None if the entry is not one."""
+        if not isinstance(entry, dict) or "experiment" not in entry:
+            return None
+
+        experiment = entry["experiment"]
+        for name, value in entry["data"].items():
+            setattr(experiment, name, value)
+        return experiment
+
+    @staticmethod
+    def dumps_experiment(experiment: Any) -> bytes:
+        """Serialize a prepared experiment with its dataset, e.g. to hand it to worker processes."""
+        return cloudpickle.dumps(ExperimentCache.pack_experiment(experiment))
+
+    @staticmethod
+    def loads_experiment(payload: bytes) -> Any:
+        """Restore an experiment serialized by dumps_experiment."""
+        return ExperimentCache.unpack_experiment(cloudpickle.loads(payload))
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.pkl"
+
+    def _evict(self) -> None:
+        entries = []
+        for path in self.cache_dir.glob("*.pkl"):
+            try:
+                stat = path.stat()
+                entries.append((stat.st_mtime, stat.st_size, path))
+            except FileNotFoundError:
+                continue
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            logger.info(f"Evicted cache entry {path.name}")
+
+
+# Global experiment cache instance
+experiment_cache = ExperimentCache(
+    settings.experiment_cache_dir,
+    settings.EXPERIMENT_CACHE_MAX_MB * 1024 * 1024,
+    settings.EXPERIMENT_CACHE_ENABLED
+)
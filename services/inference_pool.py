@@ -0,0 +1,76 @@
+"""
+Thread pool for model loading and inference, off the event loop.
+"""
+
+import asyncio
+import functools
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class InferencePool:
+    """
+    Runs model loading and scoring on a dedicated, fixed-size thread pool.
+
+    Threads suit inference since estimators spend most of their time in
+    native code that releases the GIL. Each model may use only a limited
+    number of threads at once, so a burst of requests for one hot model
+    queues behind its own limit instead of taking every thread.
+    """
+
+    def __init__(self, max_workers: int, per_model_limit: int):
+        self.max_workers = max_workers
+        self.per_model_limit = per_model_limit
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._limits: Dict[str, asyncio.Semaphore] = {}
+        self._users: Dict[str, int] = {}
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="inference")
+        return self._executor
+
+    async def run(self, model_filename: str, func: Callable, *args, **kwargs) -> Any:
+        """Run func(*args, **kwargs) on the pool within the concurrency limit of a model."""
+        semaphore = self._limits.get(model_filename)
+        if semaphore is None:
+            semaphore = self._limits[model_filename] = asyncio.Semaphore(self.per_model_limit)
+        self._users[model_filename] = self._users.get(model_filename, 0) + 1
+
+        try:
+            async with semaphore:
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(self.executor, functools.partial(func, *args, **kwargs))
+        finally:
+            # Forget the limit of a model nobody is using, so it does not grow with every model seen
+            self._users[model_filename] -= 1
+            if not self._users[model_filename]:
+                del self._users[model_filename]
+                del self._limits[model_filename]
+
+    def stats(self) -> Dict[str, Any]:
+        """Get the pool size and the number of running or waiting calls per model."""
+        return {
+            "max_workers": self.max_workers,
+            "per_model_limit": self.per_model_limit,
+            "models": dict(self._users)
+        }
+
+    def shutdown(self) -> None:
+        """Stop the pool threads once their current calls finish."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+# Global inference pool instance
+inference_pool = InferencePool(
+    settings.INFERENCE_MAX_WORKERS,
+    settings.INFERENCE_PER_MODEL_CONCURRENCY
+)
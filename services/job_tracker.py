@@ -0,0 +1,154 @@
+"""
+In-process registry of background training jobs.
+"""
+
+import asyncio
+import logging
+from typing import Any, AsyncIterator, Coroutine, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class JobTracker:
+    """Keeps references to running job tasks so they can be awaited or inspected."""
+
+    TERMINAL_STAGES = ("completed", "failed", "cancelled")
+
+    def __init__(self):
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._events: Dict[str, List[Dict[str, Any]]] = {}
+        self._subscribers: Dict[str, List[asyncio.Queue]] = {}
+        self._inflight: Dict[str, Dict[str, Any]] = {}
+        self._fingerprints: Dict[str, str] = {}
+
+    def start(self, job_id: str, coro: Coroutine) -> asyncio.Task:
+        """Schedule a job coroutine on the event loop."""
+        task = asyncio.create_task(coro, name=f"job-{job_id}")
+        self._tasks[job_id] = task
+        task.add_done_callback(lambda t: self._on_done(job_id, t))
+        return task
+
+    def _on_done(self, job_id: str, task: asyncio.Task) -> None:
+        self._tasks.pop(job_id, None)
+        # Events are persisted on the job document by the job itself
+        self._events.pop(job_id, None)
+        self._subscribers.pop(job_id, None)
+        self.release(job_id)
+        # Retrieve the exception so background failures are not reported as unhandled;
+        # the job coroutine has already recorded the failure on the job document
+        if not task.cancelled() and task.exception() is not None:
+            logger.info(f"Background job {job_id} finished with error: {task.exception()}")
+
+    def get(self, job_id: str) -> Optional[asyncio.Task]:
+        """Get the task for a running job."""
+        return self._tasks.get(job_id)
+
+    def claim(self, fingerprint: str, job: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Register a job as the in-flight run for a fingerprint.
+
+        Returns the job already in flight for the fingerprint if there is one,
+        otherwise registers and returns the given job.
+        """
+        existing = self._inflight.get(fingerprint)
+        if existing is not None:
+            return existing
+        self._inflight[fingerprint] = job
+        self._fingerprints[job["job_id"]] = fingerprint
+        return job
+
+    def find_inflight(self, fingerprint: str) -> Optional[Dict[str, Any]]:
+        """Get the job currently in flight for a fingerprint."""
+        return self._inflight.get(fingerprint)
+
+    def release(self, job_id: str) -> None:
+        """Remove the in-flight registration of a job."""
+        fingerprint = self._fingerprints.pop(job_id, None)
+        if fingerprint is not None:
+            self._inflight.pop(fingerprint, None)
+
+    def publish(self, job_id: str, event: Dict[str, Any]) -> None:
+        """Record a progress event for a job and forward it to subscribers."""
+        self._events.setdefault(job_id, []).append(event)
+        for queue in self._subscribers.get(job_id, []):
+            queue.put_nowait(event)
+
+    def events(self, job_id: str) -> List[Dict[str, Any]]:
+        """Get the progress events recorded so far for a running job."""
+        return list(self._events.get(job_id, []))
+
+    def latest_event(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Get the most recent progress event for a running job."""
+        events = self._events.get(job_id)
+        return events[-1] if events else None
+
+    async def subscribe(self, job_id: str) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yield past and live events of a running job until it finishes.
+
+        Ends without a terminal event if the job had already finished when
+        iteration started; its events are then persisted on the job document.
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        history = self.events(job_id)
+        self._subscribers.setdefault(job_id, []).append(queue)
+
+        try:
+            # The job may have finished between creating and iterating the subscription
+            if job_id not in self._tasks:
+                return
+
+            for event in history:
+                yield event
+                if event["stage"] in self.TERMINAL_STAGES:
+                    return
+
+            while True:
+                event = await queue.get()
+                yield event
+                if event["stage"] in self.TERMINAL_STAGES:
+                    return
+        finally:
+            subscribers = self._subscribers.get(job_id, [])
+            if queue in subscribers:
+                subscribers.remove(queue)
+            if not subscribers:
+                self._subscribers.pop(job_id, None)
+
+    async def cancel(self, job_id: str, timeout: float = 10.0) -> bool:
+        """Cancel a running job and wait briefly for it to record its outcome."""
+        task = self._tasks.get(job_id)
+        if task is None:
+            return False
+        task.cancel()
+        await asyncio.wait({task}, timeout=timeout)
+        return True
+
+    async def wait(self, job_id: str) -> Any:
+        """Wait for a running job and return its result."""
+        task = self._tasks.get(job_id)
+        if task is None:
+            raise KeyError(f"Job {job_id} is not running")
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if task.cancelled():
+                raise RuntimeError(f"Job {job_id} was cancelled")
+            raise
+
+    async def shutdown(self) -> None:
+        """Cancel all running jobs."""
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks.clear()
+        self._events.clear()
+        self._subscribers.clear()
+        self._inflight.clear()
+        self._fingerprints.clear()
+
+
+# Global job tracker instance
+job_tracker = JobTracker()
@@ -0,0 +1,131 @@
+"""
+In-memory LRU cache of loaded models for serving predictions.
+"""
+
+import pickle
+import logging
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+MB = 1024 * 1024
+
+
+class ModelCache:
+    """
+    Keeps unpickled models in memory, keyed by filename and modification time.
+
+    A model file replaced on disk (e.g. by promoting a candidate) has a new
+    mtime, so the stale entry is reloaded on its next use. Entries are evicted
+    least recently used first once their total size exceeds the budget; the
+    size of a model is approximated by the size of its pickle.
+
+    Small metadata needed to serve a model (e.g. its expected input) can be
+    kept on its entry, so it is evicted and invalidated together with it.
+    """
+
+    def __init__(self, max_bytes: int, enabled: bool = True):
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, filepath: Path) -> Any:
+        """Get a loaded model, loading it from disk if it is not cached or has changed."""
+        key = filepath.name
+        try:
+            stat = filepath.stat()
+        except FileNotFoundError:
+            self.invalidate(key)
+            raise
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry["mtime_ns"] == stat.st_mtime_ns:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry["model"]
+            self.misses += 1
+
+        with open(filepath, 'rb') as f:
+            model = pickle.load(f)
+
+        if not self.enabled or stat.st_size > self.max_bytes:
+            return model
+
+        with self._lock:
+            self._pop(key)
+            self._entries[key] = {"model": model, "mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+            self._bytes += stat.st_size
+            while self._bytes > self.max_bytes:
+                evicted_key, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted["size"]
+                self.evictions += 1
+                logger.info(f"Evicted model {evicted_key} from the model cache")
+
+        return model
+
+    def get_metadata(self, filename: str) -> Optional[Dict[str, Any]]:
+        """Get the metadata kept with a cached model, None if there is none."""
+        with self._lock:
+            entry = self._entries.get(filename)
+            return None if entry is None else entry.get("metadata")
+
+    def put_metadata(self, filename: str, metadata: Dict[str, Any]) -> None:
+        """Keep metadata with a cached model; nothing is kept for a model that is not cached."""
+        with self._lock:
+            entry = self._entries.get(filename)
+            if entry is not None:
+                entry["metadata"] = metadata
+
+    def invalidate(self, filename: str) -> bool:
+        """Drop a model and its metadata from the cache, e.g. after its file was deleted or replaced."""
+        with self._lock:
+            removed = self._pop(filename)
+            if removed:
+                self.invalidations += 1
+            return removed
+
+    def invalidate_many(self, filenames: Iterable[str]) -> int:
+        """Drop several models from the cache and return how many were cached."""
+        return sum(1 for filename in filenames if self.invalidate(filename))
+
+    def stats(self) -> Dict[str, Any]:
+        """Get hit and miss counts and the current size of the cache."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "entries": len(self._entries),
+                "size_mb": round(self._bytes / MB, 1),
+                "max_size_mb": round(self.max_bytes / MB, 1),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations
+            }
+
+    def _pop(self, key: str) -> bool:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        self._bytes -= entry["size"]
+        return True
+
+
+# Global model cache instance
+model_cache = ModelCache(
+    settings.MODEL_CACHE_MAX_MB * MB,
+    settings.MODEL_CACHE_ENABLED
+)
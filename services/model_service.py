@@ -2,12 +2,18 @@
 Model management service for AutoML platform.
 """
 
+import os
 import logging
+from datetime import datetime, timezone
 from pathlib import Path
 from typing import List, Dict, Any, Optional
 
+from fastapi import HTTPException
+
 from config import settings
 from db.mongodb import mongodb
+from services.model_cache import model_cache
+from utils.ensemble import ENSEMBLE_MODEL_ID
 from utils.naming import NamingUtils
 from utils.file_utils import FileManager
 from schemas.request_schemas import CompareModelsRequest
@@ -27,7 +33,7 @@ class ModelService:
             # Query models collection
             model_jobs_collection = self.db.get_collection("model_jobs")
             cursor = model_jobs_collection.find(
-                {"user_id": user_id},
+                {"user_id": user_id, "status": "completed"},
                 sort=[("created_at", -1)],
                 limit=limit
             )
@@ -63,6 +69,10 @@ class ModelService:
     async def delete_model(self, filename: str) -> bool:
         """Delete a model file and its metadata."""
         try:
+            # Delete associated plot and runner-up files while the metadata still exists
+            await self._delete_model_plots(filename)
+            await self._delete_candidate_models(filename)
+            
             # Delete from database
             model_jobs_collection = self.db.get_collection("model_jobs")
             result = await model_jobs_collection.delete_one({"filename": filename})
@@ -70,9 +80,8 @@ class ModelService:
             # Delete model file
             model_path = settings.models_dir / filename
             file_deleted = FileManager.delete_file(model_path)
-            
-            # Delete associated plot files
-            await self._delete_model_plots(filename)
+            FileManager.delete_file(settings.snapshots_dir / NamingUtils.generate_snapshot_filename(filename))
+            model_cache.invalidate(filename)
             
             if result.deleted_count > 0 or file_deleted:
                 logger.info(f"Deleted model: {filename}")
@@ -108,6 +117,102 @@ class ModelService:
             logger.error(f"Failed to delete plots for model {model_filename}: {e}")
             return 0
     
+    async def _delete_candidate_models(self, model_filename: str) -> int:
+        """Delete all runner-up model files kept for a model."""
+        try:
+            model_jobs_collection = self.db.get_collection("model_jobs")
+            model_doc = await model_jobs_collection.find_one({"filename": model_filename})
+            
+            if not model_doc or not model_doc.get("candidate_filenames"):
+                return 0
+            
+            deleted_count = 0
+            for candidate_filename in model_doc["candidate_filenames"].values():
+                model_cache.invalidate(candidate_filename)
+                if FileManager.delete_file(settings.models_dir / candidate_filename):
+                    deleted_count += 1
+            
+            logger.info(f"Deleted {deleted_count} candidate models for model {model_filename}")
+            return deleted_count
+            
+        except Exception as e:
+            logger.error(f"Failed to delete candidate models for model {model_filename}: {e}")
+            return 0
+    
+    async def promote_candidate(self, filename: str, model_id: str) -> Optional[Dict[str, Any]]:
+        """Promote a kept runner-up to be the served model of a training job."""
+        try:
+            model_jobs_collection = self.db.get_collection("model_jobs")
+            model_doc = await model_jobs_collection.find_one({"filename": filename, "status": "completed"})
+            
+            if not model_doc:
+                logger.warning(f"Model metadata not found: {filename}")
+                return None
+            
+            candidate_filenames = dict(model_doc.get("candidate_filenames") or {})
+            candidate_path = settings.models_dir / candidate_filenames.get(model_id, "")
+            if model_id not in candidate_filenames or not candidate_path.exists():
+                raise HTTPException(
+                    status_code=404,
+                    detail=f"Candidate model '{model_id}' was not kept for {filename}"
+                )
+            
+            entry = next(
+                (e for e in model_doc.get("leaderboard", []) if e["model_id"] == model_id),
+                {}
+            )
+            # The ensemble is not on the leaderboard, only its out-of-fold score is known
+            if model_id == ENSEMBLE_MODEL_ID and model_doc.get("ensemble"):
+                ensemble = model_doc["ensemble"]
+                entry = {
+                    "model_name": f"{ensemble['method']} ensemble of {', '.join(ensemble['members'])}",
+                    "metrics": {"best_score": ensemble["cv_score"]}
+                }
+            
+            # Swap files, keeping the current model as a candidate so it can be promoted back
+            model_path = settings.models_dir / filename
+            previous_id = model_doc.get("best_model_id")
+            candidate_filenames.pop(model_id)
+            if previous_id and model_path.exists():
+                previous_filename = NamingUtils.generate_candidate_filename(filename, previous_id)
+                os.replace(model_path, settings.models_dir / previous_filename)
+                candidate_filenames[previous_id] = previous_filename
+            os.replace(candidate_path, model_path)
+            model_cache.invalidate_many([filename, candidate_path.name, *candidate_filenames.values()])
+            
+            # Existing plots describe the previous model, the promoted one is rendered on request
+            await self._delete_model_plots(filename)
+            
+            metrics = entry.get("metrics", {})
+            update = {
+                "best_model": entry.get("model_name", model_id),
+                "best_model_id": model_id,
+                "best_model_score": metrics.get("best_score", 0.0),
+                "metrics": metrics,
+                "candidate_filenames": candidate_filenames,
+                "plot_filenames": [],
+                "plot_files": {},
+                "updated_at": datetime.now(timezone.utc)
+            }
+            await model_jobs_collection.update_one({"filename": filename}, {"$set": update})
+            
+            logger.info(f"Promoted candidate {model_id} for model {filename}")
+            
+            return {
+                "filename": filename,
+                "best_model": update["best_model"],
+                "best_model_id": model_id,
+                "best_model_score": update["best_model_score"],
+                "metrics": metrics,
+                "previous_model_id": previous_id
+            }
+            
+        except HTTPException:
+            raise
+        except Exception as e:
+            logger.error(f"Failed to promote candidate {model_id} for model {filename}: {e}")
+            raise
+    
     async def get_model_metrics(self, filename: str) -> Optional[Dict[str, Any]]:
         """Get detailed metrics for a specific model."""
         try:
@@ -127,6 +232,8 @@ class ModelService:
                 "best_model": model_doc.get("best_model"),
                 "best_model_score": model_doc.get("best_model_score"),
                 "metrics": model_doc.get("metrics", {}),
+                "leaderboard": model_doc.get("leaderboard", []),
+                "kept_candidates": list((model_doc.get("candidate_filenames") or {}).keys()),
                 "feature_names": model_doc.get("feature_names", []),
                 "dataset_rows": model_doc.get("dataset_rows"),
                 "dataset_columns": model_doc.get("dataset_columns"),
@@ -141,39 +248,6 @@ class ModelService:
             logger.error(f"Failed to get model metrics for {filename}: {e}")
             raise
     
-    async def get_model_plots(self, filename: str) -> Optional[List[Dict[str, str]]]:
-        """Get all plot URLs associated with a specific model."""
-        try:
-            model_jobs_collection = self.db.get_collection("model_jobs")
-            model_doc = await model_jobs_collection.find_one({"filename": filename})
-            
-            if not model_doc:
-                logger.warning(f"Model metadata not found: {filename}")
-                return None
-            
-            plot_filenames = model_doc.get("plot_filenames", [])
-            
-            plots = []
-            for plot_filename in plot_filenames:
-                # Parse plot filename to get plot type
-                plot_info = NamingUtils.parse_plot_filename(plot_filename)
-                plot_type = plot_info.get("plot_type", "unknown")
-                
-                # Check if plot file exists
-                plot_path = settings.plots_dir / plot_filename
-                if plot_path.exists():
-                    plots.append({
-                        "plot_type": plot_type,
-                        "filename": plot_filename,
-                        "url": f"/api/plot/view/{plot_filename}"
-                    })
-            
-            return plots
-            
-        except Exception as e:
-            logger.error(f"Failed to get model plots for {filename}: {e}")
-            raise
-    
     async def compare_models(self, request: CompareModelsRequest) -> Dict[str, Any]:
         """Compare multiple models for a user."""
         try:
@@ -181,7 +255,7 @@ class ModelService:
             model_filenames = request.model_filenames
 
             # Build query
-            query = {"user_id": user_id}
+            query = {"user_id": user_id, "status": "completed"}
             if model_filenames:
                 query["filename"] = {"$in": model_filenames}
             
@@ -0,0 +1,335 @@
+"""
+Evaluation plot service with lazy, cached rendering of PyCaret plots.
+"""
+
+import pickle
+import asyncio
+import logging
+import tempfile
+import threading
+from concurrent.futures import as_completed
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+import matplotlib
+import pandas as pd
+from fastapi import HTTPException
+
+from config import settings
+from db.mongodb import mongodb
+from services.experiment_cache import ExperimentCache
+from services.worker_pool import open_process_pool, plot_pool, report_progress
+from utils.naming import NamingUtils
+
+logger = logging.getLogger(__name__)
+
+# Evaluation plots offered for each problem type
+EVALUATION_PLOT_TYPES = {
+    "classification": ['confusion_matrix', 'class_report', 'roc'],
+    "regression": ['residuals', 'prediction_error']
+}
+
+# One render at a time per model, so concurrent requests share the result
+_render_locks: Dict[str, asyncio.Lock] = {}
+
+# pyplot keeps its current figure per process, so renders on threads of the
+# same process (the thread executor) take turns instead of drawing into each other
+_pyplot_lock = threading.Lock()
+
+
+class PlotService:
+    """Service for rendering evaluation plots on demand and serving them from disk."""
+
+    def __init__(self):
+        self.db = mongodb
+
+    @staticmethod
+    def plot_types(problem_type: str) -> List[str]:
+        """Get the evaluation plot types available for a problem type."""
+        return EVALUATION_PLOT_TYPES.get(problem_type, [])
+
+    @staticmethod
+    def plot_url(model_filename: str, plot_type: str) -> str:
+        """Get the URL a plot of a model is served from."""
+        return f"/model/plots/{model_filename}/{plot_type}"
+
+    @staticmethod
+    def plot_urls(model_filename: str, problem_type: str) -> List[str]:
+        """Get the URLs of all evaluation plots of a model."""
+        return [
+            PlotService.plot_url(model_filename, plot_type)
+            for plot_type in PlotService.plot_types(problem_type)
+        ]
+
+    @staticmethod
+    def snapshot_path(model_filename: str) -> Path:
+        """Get the path of the plot snapshot stored for a model."""
+        return settings.snapshots_dir / NamingUtils.generate_snapshot_filename(model_filename)
+
+    @staticmethod
+    def save_snapshot(
+        model_filename: str,
+        df_clean: pd.DataFrame,
+        target_column: str,
+        problem_type: str,
+        models: Dict[str, Any]
+    ) -> None:
+        """
+        Store what is needed to render plots after training has finished.
+
+        The models are the cross-validated (not finalized) estimators, so plots
+        re-created from the same dataset and session are scored on the holdout.
+        """
+        snapshot_path = PlotService.snapshot_path(model_filename)
+        snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(snapshot_path, 'wb') as f:
+            pickle.dump({
+                "dataset": df_clean,
+                "target_column": target_column,
+                "problem_type": problem_type,
+                "models": models
+            }, f)
+
+    @staticmethod
+    def render_plots(
+        experiment,
+        model,
+        user_id: str,
+        model_name: str,
+        plot_types: List[str]
+    ) -> Dict[str, str]:
+        """Render evaluation plots with PyCaret and return the plot filenames by plot type."""
+        # Plots are only ever written to files, never shown
+        matplotlib.use("Agg")
+        plot_files = {}
+
+        # PyCaret writes plots under a fixed name, so every render gets its own
+        # scratch directory instead of sharing the working directory
+        scratch_root = settings.storage_dir / "temp"
+        scratch_root.mkdir(parents=True, exist_ok=True)
+
+        with _pyplot_lock, tempfile.TemporaryDirectory(prefix=f"plots_{model_name}_", dir=scratch_root) as scratch_dir:
+            for plot_type in plot_types:
+                try:
+                    # Generate plot using PyCaret
+                    saved_plot = experiment.plot_model(
+                        model,
+                        plot=plot_type,
+                        save=scratch_dir,
+                        verbose=False
+                    )
+
+                    # Move and rename the saved plot
+                    plot_filename = NamingUtils.generate_plot_filename(
+                        user_id, model_name, plot_type
+                    )
+
+                    source_plot = Path(saved_plot) if isinstance(saved_plot, str) else None
+                    if source_plot is None or not source_plot.exists():
+                        source_plot = next(Path(scratch_dir).glob("*.png"), None)
+                    target_plot = settings.plots_dir / plot_filename
+
+                    if source_plot is not None:
+                        source_plot.replace(target_plot)
+                        plot_files[plot_type] = plot_filename
+                        report_progress("plot_rendered", plot_type=plot_type)
+
+                except Exception as plot_error:
+                    logger.warning(f"Failed to generate {plot_type} plot: {plot_error}")
+
+        return plot_files
+
+    @staticmethod
+    def render_plots_parallel(
+        experiment,
+        model,
+        user_id: str,
+        model_name: str,
+        plot_types: List[str]
+    ) -> Dict[str, str]:
+        """
+        Render each plot type in its own worker process and return the plot filenames by plot type.
+
+        Workers receive this prepared experiment instead of running setup
+        themselves, so every plot is drawn from the same holdout data.
+        """
+        # Serialized once, PyCaret would otherwise leave the dataset out
+        experiment_payload = ExperimentCache.dumps_experiment(experiment)
+        executor = open_process_pool(min(len(plot_types), settings.PLOT_MAX_WORKERS))
+        plot_files = {}
+
+        try:
+            futures = {
+                executor.submit(
+                    render_plots_from_experiment, experiment_payload, model, [plot_type], user_id, model_name
+                ): plot_type
+                for plot_type in plot_types
+            }
+
+            for future in as_completed(futures):
+                try:
+                    rendered = future.result()
+                except Exception as e:
+                    logger.warning(f"Plot worker for {futures[future]} failed: {e}")
+                    continue
+
+                plot_files.update(rendered)
+                for plot_type in rendered:
+                    report_progress("plot_rendered", plot_type=plot_type)
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        return plot_files
+
+    async def get_model_plots(self, filename: str) -> Optional[List[Dict[str, str]]]:
+        """Get all evaluation plots of a model, rendering the ones not cached yet."""
+        try:
+            model_doc = await self._find_model(filename)
+            if not model_doc:
+                return None
+
+            plot_files = await self._ensure_plots(model_doc, self.plot_types(model_doc["model_type"]))
+
+            return [
+                {
+                    "plot_type": plot_type,
+                    "filename": plot_filename,
+                    "url": self.plot_url(filename, plot_type)
+                }
+                for plot_type, plot_filename in plot_files.items()
+            ]
+
+        except Exception as e:
+            logger.error(f"Failed to get model plots for {filename}: {e}")
+            raise
+
+    async def get_plot_path(self, filename: str, plot_type: str) -> Optional[Path]:
+        """Get the file of one evaluation plot of a model, rendering it on first request."""
+        try:
+            model_doc = await self._find_model(filename)
+            if not model_doc:
+                return None
+
+            if plot_type not in self.plot_types(model_doc["model_type"]):
+                raise HTTPException(
+                    status_code=404,
+                    detail=f"Plot '{plot_type}' is not available for {model_doc['model_type']} models"
+                )
+
+            plot_files = await self._ensure_plots(model_doc, [plot_type])
+            if plot_type not in plot_files:
+                return None
+
+            return settings.plots_dir / plot_files[plot_type]
+
+        except HTTPException:
+            raise
+        except Exception as e:
+            logger.error(f"Failed to get {plot_type} plot for {filename}: {e}")
+            raise
+
+    async def _find_model(self, filename: str) -> Optional[Dict[str, Any]]:
+        """Find the metadata of a completed model."""
+        model_jobs_collection = self.db.get_collection("model_jobs")
+        model_doc = await model_jobs_collection.find_one({"filename": filename, "status": "completed"})
+
+        if not model_doc:
+            logger.warning(f"Model metadata not found: {filename}")
+
+        return model_doc
+
+    def _cached_plots(self, model_doc: Dict[str, Any]) -> Dict[str, str]:
+        """Get the rendered plots of a model that are still on disk."""
+        return {
+            plot_type: plot_filename
+            for plot_type, plot_filename in (model_doc.get("plot_files") or {}).items()
+            if (settings.plots_dir / plot_filename).exists()
+        }
+
+    async def _ensure_plots(self, model_doc: Dict[str, Any], plot_types: List[str]) -> Dict[str, str]:
+        """Render the missing plots of a model and record them on the model document."""
+        filename = model_doc["filename"]
+        lock = _render_locks.setdefault(filename, asyncio.Lock())
+
+        async with lock:
+            # Another request may have rendered the plots while this one waited
+            model_jobs_collection = self.db.get_collection("model_jobs")
+            model_doc = await model_jobs_collection.find_one({"filename": filename}) or model_doc
+            plot_files = self._cached_plots(model_doc)
+
+            missing = [plot_type for plot_type in plot_types if plot_type not in plot_files]
+            if not missing:
+                return plot_files
+
+            snapshot_path = self.snapshot_path(filename)
+            if not model_doc.get("best_model_id") or not snapshot_path.exists():
+                logger.warning(f"No plot snapshot available for model {filename}")
+                return plot_files
+
+            # Rendered on the plot pool, not behind long training jobs
+            rendered = await plot_pool.run(
+                render_plots_in_worker,
+                filename,
+                model_doc["best_model_id"],
+                missing,
+                model_doc["user_id"],
+                Path(filename).stem
+            )
+            plot_files.update(rendered)
+
+            await model_jobs_collection.update_one(
+                {"filename": filename},
+                {"$set": {
+                    "plot_files": plot_files,
+                    "plot_filenames": list(plot_files.values()),
+                    "updated_at": datetime.now(timezone.utc)
+                }}
+            )
+            logger.info(f"Rendered {len(rendered)} plots for model {filename}")
+
+            return plot_files
+
+
+def render_plots_from_experiment(
+    experiment_payload: bytes,
+    model,
+    plot_types: List[str],
+    user_id: str,
+    model_name: str
+) -> Dict[str, str]:
+    """Entry point for parallel plot workers, rendering from a serialized experiment."""
+    experiment = ExperimentCache.loads_experiment(experiment_payload)
+    return PlotService.render_plots(experiment, model, user_id, model_name, plot_types)
+
+
+def render_plots_in_worker(
+    model_filename: str,
+    model_id: str,
+    plot_types: List[str],
+    user_id: str,
+    model_name: str
+) -> Dict[str, str]:
+    """Entry point for plot rendering worker processes, rebuilding the experiment from the plot snapshot."""
+    # Imported here since the training service itself depends on this module
+    from services.train_service import TrainService
+
+    snapshot_path = PlotService.snapshot_path(model_filename)
+    with open(snapshot_path, 'rb') as f:
+        snapshot = pickle.load(f)
+
+    # Promoted ensembles have no single estimator PyCaret can plot
+    if model_id not in snapshot["models"]:
+        logger.warning(f"No plottable model {model_id} in snapshot {snapshot_path}")
+        return {}
+
+    # Same session_id gives the same train/holdout split as the training run,
+    # and the same setup parameters reuse the experiment training cached
+    experiment = TrainService()._setup_pycaret(
+        snapshot["dataset"], snapshot["target_column"], snapshot["problem_type"]
+    )
+    model = snapshot["models"][model_id]
+
+    if settings.PARALLEL_PLOTS and len(plot_types) > 1:
+        return PlotService.render_plots_parallel(experiment, model, user_id, model_name, plot_types)
+    return PlotService.render_plots(experiment, model, user_id, model_name, plot_types)
@@ -0,0 +1,155 @@
+"""
+Micro-batching of concurrent single-row predictions against the same model.
+"""
+
+import asyncio
+import logging
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from config import settings
+from services.inference_pool import inference_pool
+
+logger = logging.getLogger(__name__)
+
+# Predictions and class probabilities (None if the model has none) of a frame
+ScoreResult = Tuple[List[Any], Optional[List[List[float]]]]
+
+# Model file, loaded model object and the (column, dtype) pairs of the input rows
+BatchKey = Tuple[str, int, Tuple[Tuple[str, str], ...]]
+
+
+class PredictionBatcher:
+    """
+    Collects prediction requests for the same model and input columns for a
+    short window, or until the batch is full, and scores them with one
+    vectorized call.
+
+    Per-call overhead of the preprocessing pipeline dominates single-row
+    predictions, so one call over many rows raises throughput at the cost of
+    up to one window of added latency. Batches are scored on the inference
+    pool within the model's concurrency limit. If the combined batch fails
+    to score, e.g. because of one bad row, each request is scored on its own
+    so only that request fails.
+    """
+
+    def __init__(self, window_ms: float, max_batch_rows: int, enabled: bool = True):
+        self.window = window_ms / 1000
+        self.max_batch_rows = max_batch_rows
+        self.enabled = enabled
+        self._batches: Dict[BatchKey, Dict[str, Any]] = {}
+        self.batches = 0
+        self.rows = 0
+
+    async def submit(
+        self,
+        model_filename: str,
+        model,
+        input_df: pd.DataFrame,
+        score: Callable[[Any, pd.DataFrame], ScoreResult]
+    ) -> ScoreResult:
+        """Score input rows with a model, batched with concurrent requests for the same model."""
+        if not self.enabled:
+            return await inference_pool.run(model_filename, score, model, input_df)
+
+        loop = asyncio.get_running_loop()
+        # A reloaded model is a different object, so it gets its own batch. Only rows
+        # with the same columns and dtypes are combined, so concatenating them adds
+        # no NaN columns for keys other requests did not send and coerces no dtypes
+        batch_key = (
+            model_filename,
+            id(model),
+            tuple((str(column), str(dtype)) for column, dtype in input_df.dtypes.items())
+        )
+
+        batch = self._batches.get(batch_key)
+        if batch is None:
+            batch = {
+                "model_filename": model_filename,
+                "model": model,
+                "score": score,
+                "frames": [],
+                "futures": [],
+                "rows": 0
+            }
+            batch["timer"] = loop.call_later(self.window, self._flush, batch_key)
+            self._batches[batch_key] = batch
+
+        future = loop.create_future()
+        batch["frames"].append(input_df)
+        batch["futures"].append(future)
+        batch["rows"] += len(input_df)
+
+        if batch["rows"] >= self.max_batch_rows:
+            batch["timer"].cancel()
+            self._flush(batch_key)
+
+        return await future
+
+    def stats(self) -> Dict[str, Any]:
+        """Get the number of batches scored and their average size."""
+        return {
+            "enabled": self.enabled,
+            "window_ms": self.window * 1000,
+            "max_batch_rows": self.max_batch_rows,
+            "batches": self.batches,
+            "rows": self.rows,
+            "average_batch_rows": round(self.rows / self.batches, 2) if self.batches else None
+        }
+
+    def _flush(self, batch_key: BatchKey) -> None:
+        batch = self._batches.pop(batch_key, None)
+        if batch is not None:
+            asyncio.get_running_loop().create_task(self._run(batch))
+
+    async def _run(self, batch: Dict[str, Any]) -> None:
+        """Score a collected batch and hand every request its own rows of the result."""
+        frames, futures = batch["frames"], batch["futures"]
+        self.batches += 1
+        self.rows += batch["rows"]
+
+        try:
+            combined = pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+            predictions, probabilities = await inference_pool.run(
+                batch["model_filename"], batch["score"], batch["model"], combined
+            )
+        except Exception as e:
+            if len(frames) == 1:
+                if not futures[0].done():
+                    futures[0].set_exception(e)
+                return
+            logger.warning(f"Batch of {len(frames)} predictions failed, scoring them one by one: {e}")
+            await self._run_each(batch)
+            return
+
+        offset = 0
+        for frame, future in zip(frames, futures):
+            end = offset + len(frame)
+            if not future.done():
+                future.set_result((
+                    predictions[offset:end],
+                    probabilities[offset:end] if probabilities is not None else None
+                ))
+            offset = end
+
+    async def _run_each(self, batch: Dict[str, Any]) -> None:
+        for frame, future in zip(batch["frames"], batch["futures"]):
+            if future.done():
+                continue
+            try:
+                result = await inference_pool.run(batch["model_filename"], batch["score"], batch["model"], frame)
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+            else:
+                if not future.done():
+                    future.set_result(result)
+
+
+# Global prediction batcher instance
+prediction_batcher = PredictionBatcher(
+    settings.PREDICT_BATCH_WINDOW_MS,
+    settings.PREDICT_MAX_BATCH_ROWS,
+    settings.PREDICT_BATCHING_ENABLED
+)
@@ -0,0 +1,144 @@
+"""
+Dataset profile service computing column facts once per uploaded dataset.
+"""
+
+import logging
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+from fastapi import HTTPException
+
+from config import settings
+from db.mongodb import mongodb
+from db.models import DatasetProfile
+
+logger = logging.getLogger(__name__)
+
+
+class ProfileService:
+    """Service for building, storing and reading dataset profiles."""
+
+    def __init__(self):
+        self.db = mongodb
+
+    async def get_or_create(
+        self,
+        df: pd.DataFrame,
+        dataset_sha256: str,
+        target_column: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Get the stored profile of a dataset, building it on first upload.
+
+        Target statistics are added the first time a target column is used
+        with a dataset that is already profiled.
+        """
+        try:
+            profiles_collection = self.db.get_collection("dataset_profiles")
+            key = {"dataset_sha256": dataset_sha256}
+
+            profile_doc = await profiles_collection.find_one(key)
+            if profile_doc is None:
+                profile = self.build_profile(df, dataset_sha256, target_column)
+                # Concurrent uploads of the same dataset store one profile
+                await profiles_collection.update_one(
+                    key,
+                    {"$setOnInsert": profile.model_dump(by_alias=True)},
+                    upsert=True
+                )
+                logger.info(f"Built dataset profile for {dataset_sha256[:12]} ({profile.rows}x{profile.columns})")
+                profile_doc = await profiles_collection.find_one(key)
+
+            target_stats = profile_doc.get("target_stats") or {}
+            if target_column is not None and target_column not in target_stats:
+                target_stats[target_column] = self.build_target_stats(df, target_column)
+                await profiles_collection.update_one(key, {"$set": {"target_stats": target_stats}})
+                profile_doc["target_stats"] = target_stats
+
+            return profile_doc
+
+        except Exception as e:
+            logger.error(f"Failed to get dataset profile: {e}")
+            raise
+
+    async def get_profile(self, dataset_sha256: str) -> Optional[Dict[str, Any]]:
+        """Get the stored profile of a dataset."""
+        profiles_collection = self.db.get_collection("dataset_profiles")
+        return await profiles_collection.find_one({"dataset_sha256": dataset_sha256})
+
+    @staticmethod
+    def build_profile(df: pd.DataFrame, dataset_sha256: str, target_column: Optional[str] = None) -> DatasetProfile:
+        """Compute column facts with one vectorized aggregation per kind."""
+        null_counts = df.isna().sum()
+        unique_counts = df.nunique(dropna=True)
+        numeric = df.select_dtypes(include="number")
+        bounds = numeric.agg(["min", "max"]) if not numeric.empty else pd.DataFrame()
+
+        column_profiles = {}
+        for column in df.columns:
+            is_numeric = column in numeric.columns
+            column_profiles[str(column)] = {
+                "dtype": str(df[column].dtype),
+                "is_numeric": is_numeric,
+                "null_count": int(null_counts[column]),
+                "n_unique": int(unique_counts[column]),
+                "min": float(bounds.at["min", column]) if is_numeric and pd.notna(bounds.at["min", column]) else None,
+                "max": float(bounds.at["max", column]) if is_numeric and pd.notna(bounds.at["max", column]) else None
+            }
+
+        target_stats = {}
+        if target_column is not None:
+            target_stats[target_column] = ProfileService.build_target_stats(df, target_column)
+
+        return DatasetProfile(
+            dataset_sha256=dataset_sha256,
+            rows=len(df),
+            columns=len(df.columns),
+            column_profiles=column_profiles,
+            target_stats=target_stats
+        )
+
+    @staticmethod
+    def build_target_stats(df: pd.DataFrame, target_column: str) -> Dict[str, Any]:
+        """Compute the distribution of a target column."""
+        target = df[target_column]
+        target_stats = {
+            "is_numeric": bool(pd.api.types.is_numeric_dtype(target)),
+            "n_unique": int(target.nunique()),
+            "rows": int(target.notna().sum())
+        }
+        if target_stats["is_numeric"]:
+            target_stats["mean"] = float(target.mean())
+            target_stats["std"] = float(target.std())
+        # Class distribution for low-cardinality targets
+        if target_stats["n_unique"] <= settings.SAMPLING_MAX_STRATA:
+            target_stats["class_counts"] = {
+                str(value): int(count) for value, count in target.value_counts().items()
+            }
+        return target_stats
+
+    @staticmethod
+    def validate_input(profile: Dict[str, Any], feature_names: List[str], input_df: pd.DataFrame) -> None:
+        """Reject prediction input that misses features or has non-numeric values for numeric features."""
+        missing = [name for name in feature_names if name not in input_df.columns]
+        if missing:
+            raise HTTPException(
+                status_code=422,
+                detail=f"Missing input features: {', '.join(missing)}"
+            )
+
+        invalid = []
+        for name in feature_names:
+            column_profile = profile["column_profiles"].get(name)
+            if not column_profile or not column_profile["is_numeric"]:
+                continue
+            values = input_df[name]
+            # Missing values are imputed by the model pipeline, unparseable ones are not
+            if (pd.to_numeric(values, errors="coerce").isna() & values.notna()).any():
+                invalid.append(name)
+
+        if invalid:
+            raise HTTPException(
+                status_code=422,
+                detail=f"Non-numeric values for numeric features: {', '.join(invalid)}"
+            )
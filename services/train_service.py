@@ -2,34 +2,73 @@
 Model training service using PyCaret for AutoML operations.
 """
 
+import json
 import time
 import pickle
+import asyncio
+import hashlib
 import logging
+import numpy as np
 import pandas as pd
+from bson import ObjectId
+from concurrent.futures import FIRST_COMPLETED, wait
+from datetime import datetime, timezone
+from itertools import chain
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple, Iterator, AsyncIterator
 
 from fastapi import UploadFile, HTTPException
-import pycaret.classification as pc_clf
-import pycaret.regression as pc_reg
+from pycaret.classification import ClassificationExperiment
+from pycaret.regression import RegressionExperiment
 
 from config import settings
 from db.mongodb import mongodb
-from db.models import ModelJob, Prediction
-from schemas.request_schemas import ModelTrainRequest, PredictionRequest
+from db.models import ModelJob, Prediction, BatchPrediction
+from schemas.request_schemas import ModelTrainRequest, PredictionRequest, BatchPredictionRequest
+from services.admission import admission_controller
+from services.experiment_cache import ExperimentCache, experiment_cache
+from services.inference_pool import inference_pool
+from services.job_tracker import job_tracker
+from services.model_cache import model_cache
+from services.plot_service import PlotService
+from services.prediction_batcher import prediction_batcher
+from services.profile_service import ProfileService
+from services.worker_pool import training_pool, report_progress, kill_executor_processes, open_process_pool
+from utils.ensemble import EnsembleBuilder, EnsembleModel, ENSEMBLE_MODEL_ID
 from utils.file_utils import FileManager
 from utils.naming import NamingUtils
+from utils.sampling import DatasetSampler
 
 logger = logging.getLogger(__name__)
 
 
 class TrainService:
     """Service for handling model training operations with PyCaret."""
+    
+    # Fixed setup parameters, so experiments and CV folds are reproducible and cacheable
+    SETUP_PARAMS = {"session_id": 123, "train_size": 0.8, "use_gpu": False}
+    
     def __init__(self):
         self.db = mongodb
     
     async def train_model(self, file: UploadFile, request: ModelTrainRequest) -> Dict[str, Any]:
         """Train ML model using PyCaret and save results."""
+        job = await self.submit_training(file, request)
+        return await self._await_job(job["job_id"])
+    
+    async def _await_job(self, job_id: str) -> Dict[str, Any]:
+        """Wait for a training job and return its result."""
+        if job_tracker.get(job_id) is not None:
+            return await job_tracker.wait(job_id)
+        
+        # Job already finished, e.g. a reused result
+        job = await self.get_job_status(job_id)
+        if job and job["status"] == "completed":
+            return job["result"]
+        raise RuntimeError((job or {}).get("error") or f"Training job {job_id} did not complete")
+    
+    async def submit_training(self, file: UploadFile, request: ModelTrainRequest) -> Dict[str, Any]:
+        """Validate the dataset, record a pending job and start training in the background."""
         start_time = time.time()
         
         try:
@@ -38,158 +77,1036 @@ class TrainService:
             temp_filepath = settings.storage_dir / "temp" / temp_filename
             temp_filepath.parent.mkdir(parents=True, exist_ok=True)
             
-            await FileManager.save_uploaded_file(file, temp_filepath)
+            file_info = await FileManager.save_uploaded_file(file, temp_filepath)
+            stage_events = [{"stage": "upload_saved", "timestamp": time.time(), "progress": 0.02}]
+            
+            # Reuse a completed or in-flight job for the same dataset and settings
+            fingerprint = self._fingerprint_request(file_info["sha256"], request)
+            reusable_job = await self._find_reusable_job(fingerprint)
+            if reusable_job:
+                temp_filepath.unlink()
+                logger.info(f"Reusing training job {reusable_job['job_id']} for user {request.user_id}")
+                return reusable_job
             
             # Read and validate dataset
-            df = await FileManager.read_csv_file(temp_filepath)
+            df = await FileManager.read_csv_file(temp_filepath, request.target_column)
+            stage_events.append({"stage": "csv_parsed", "timestamp": time.time(), "progress": 0.05})
+            
+            # Clean up temporary file, the dataset is held in memory from here on
+            if temp_filepath.exists():
+                temp_filepath.unlink()
             
             # Validate target column
             if request.target_column not in df.columns:
                 raise ValueError(f"Target column '{request.target_column}' not found in dataset")
             
-            # Determine problem type
-            problem_type = self._determine_problem_type(df, request.target_column)
+            # Profile the dataset once per upload and determine the problem type from it
+            profile = await ProfileService().get_or_create(df, file_info["sha256"], request.target_column)
+            problem_type = self._determine_problem_type(profile, request.target_column)
             
             # Clean dataset
             df_clean = self._preprocess_dataset(df, request.target_column)
             df_features = df_clean.drop(request.target_column, axis='columns')
             
-            # Setup PyCaret environment
-            if problem_type == "classification":
-                pc_clf.setup(
-                    df_clean,
-                    target=request.target_column,
-                    session_id=123,
-                    train_size=0.8,
-                    verbose=False,
-                    use_gpu=False
-                )
-                pycaret_module = pc_clf
-            else:
-                pc_reg.setup(
-                    df_clean,
-                    target=request.target_column,
-                    session_id=123,
-                    train_size=0.8,
-                    verbose=False,
-                    use_gpu=False
-                )
-                pycaret_module = pc_reg
-            
-            # Train models with limited selection for performance
-            model_types = request.model_types or settings.PYCARET_LIGHTWEIGHT_MODELS
-            models = pycaret_module.compare_models(
-                include=model_types,
-                turbo=settings.PYCARET_TURBO_MODE,
-                sort='Accuracy' if problem_type == "classification" else 'MAE',
-                n_select=1,  # Only select best model
-                verbose=False
-            )
-            
-            # Get best model (if multiple returned, take first)
-            best_model = models if not isinstance(models, list) else models[0]
-            
-            # Finalize model
-            final_model = pycaret_module.finalize_model(best_model)
-            
             # Generate model filename
             model_filename = NamingUtils.generate_model_filename(
                 request.user_id, 
                 request.dataset_name
             )
-            model_filepath = settings.models_dir / model_filename
-            # Ensure the models directory exists
-            model_filepath.parent.mkdir(parents=True, exist_ok=True)
-            # Save model
-            with open(model_filepath, 'wb') as f:
-                pickle.dump(final_model, f)
-            
-            # Get model metrics
-            metrics = self._extract_model_metrics(pycaret_module, problem_type)
-            
-            # Generate evaluation plots
-            plot_urls = await self._generate_evaluation_plots(
-                pycaret_module, 
-                request.user_id, 
-                model_filename.split('.')[0],
-                problem_type
-            )
-            
-            # Calculate training time
-            training_time = time.time() - start_time
             
-            # Store job in database
+            # Store pending job in database
             model_job = ModelJob(
                 user_id=request.user_id,
                 filename=model_filename,
                 dataset_name=request.dataset_name,
                 target_column=request.target_column,
                 model_type=problem_type,
-                best_model=str(type(best_model).__name__),
-                best_model_score=metrics.get('best_score', 0.0),
-                metrics=metrics,
-                plot_filenames=[url.split('/')[-1] for url in plot_urls],
-                feature_names=(df_features.columns),
+                feature_names=list(df_features.columns),
                 dataset_rows=len(df_clean),
                 dataset_columns=len(df_clean.columns),
-                training_time=training_time
+                dataset_sha256=file_info["sha256"],
+                status="pending",
+                progress=0.0,
+                fingerprint=fingerprint
             )
-            model_jobs_collection = self.db.get_collection("model_jobs")
-            await model_jobs_collection.insert_one(model_job.model_dump(by_alias=True))
+            job_id = str(model_job.id)
+            job = self._job_reference(job_id, "pending", model_filename)
             
-            # Clean up temporary file
-            if temp_filepath.exists():
-                temp_filepath.unlink()
+            # An identical job may have been submitted while this one was parsing
+            if settings.TRAINING_DEDUPE_ENABLED:
+                inflight_job = job_tracker.claim(fingerprint, job)
+                if inflight_job is not job:
+                    return self._reuse_inflight(inflight_job)
+            
+            try:
+                # Admit against the memory budget or queue, rejecting with 429 when the queue is full
+                queue_position = admission_controller.enqueue(
+                    job_id,
+                    request.user_id,
+                    "train",
+                    admission_controller.estimate_memory(df, settings.ADMISSION_TRAIN_MEMORY_FACTOR)
+                )
+                if queue_position is not None:
+                    model_job.status = job["status"] = "queued"
+                    job["queue_position"] = queue_position
+                
+                model_jobs_collection = self.db.get_collection("model_jobs")
+                await model_jobs_collection.insert_one(model_job.model_dump(by_alias=True))
+            except Exception:
+                job_tracker.release(job_id)
+                admission_controller.release(job_id)
+                raise
             
-            # Generate download URL
-            download_url = f"/api/v1/models/download/{model_filename}"
+            for event in stage_events:
+                self._publish_event(job_id, start_time, event)
+            if queue_position is not None:
+                self._publish_event(
+                    job_id, start_time, {"stage": "queued", "progress": 0.05, "queue_position": queue_position}
+                )
             
-            return {
-                "filename": model_filename,
-                "download_url": download_url,
-                "dataset_name": request.dataset_name,
-                "target_column": request.target_column,
-                "model_type": problem_type,
-                "best_model": str(type(best_model).__name__),
-                "best_model_score": metrics.get('best_score', 0.0),
-                "metrics": metrics,
-                "plot_urls": plot_urls,
-                "training_time": training_time
-            }
+            # Start training in the background
+            job_tracker.start(
+                job_id,
+                self._execute_job(job_id, df_clean, request, problem_type, model_filename, start_time)
+            )
+            
+            logger.info(f"Training job {job_id} submitted for user {request.user_id}")
+            
+            return job
             
         except Exception as e:
-            logger.error(f"Model training failed: {e}")
+            logger.error(f"Model training submission failed: {e}")
             # Clean up temporary file on error
             if 'temp_filepath' in locals() and temp_filepath.exists():
                 temp_filepath.unlink()
             raise e
     
+    def _fingerprint_request(self, file_hash: str, request: ModelTrainRequest) -> str:
+        """Fingerprint a training request by dataset content and the settings that shape the result."""
+        payload = {
+            "dataset_sha256": file_hash,
+            "user_id": request.user_id,
+            "target_column": request.target_column,
+            "model_types": sorted(request.model_types or settings.PYCARET_LIGHTWEIGHT_MODELS),
+            "time_budget_seconds": request.time_budget_seconds,
+            "selection_strategy": request.selection_strategy,
+            "keep_top_n": request.keep_top_n,
+            "tune": request.tune,
+            "ensemble": request.ensemble,
+            "max_dataset_cells": settings.MAX_DATASET_CELLS,
+            "max_dataset_columns": settings.MAX_DATASET_COLUMNS,
+            "turbo": settings.PYCARET_TURBO_MODE
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+    
+    async def _find_reusable_job(self, fingerprint: str) -> Optional[Dict[str, Any]]:
+        """Find an in-flight or completed job with the same fingerprint."""
+        if not settings.TRAINING_DEDUPE_ENABLED:
+            return None
+        
+        # Single-flight: attach to an identical job that is still running
+        inflight_job = job_tracker.find_inflight(fingerprint)
+        if inflight_job:
+            return self._reuse_inflight(inflight_job)
+        
+        # Result cache: return a completed job whose model is still on disk
+        model_jobs_collection = self.db.get_collection("model_jobs")
+        job_doc = await model_jobs_collection.find_one(
+            {"fingerprint": fingerprint, "status": "completed"},
+            sort=[("created_at", -1)]
+        )
+        if job_doc and (settings.models_dir / job_doc["filename"]).exists():
+            return {
+                **self._job_reference(str(job_doc["_id"]), "completed", job_doc["filename"]),
+                "reused": True
+            }
+        
+        return None
+    
+    def _job_reference(self, job_id: str, status: str, filename: str) -> Dict[str, Any]:
+        """Build the job reference returned when a training job is submitted."""
+        return {
+            "job_id": job_id,
+            "status": status,
+            "filename": filename,
+            "status_url": f"/model/jobs/{job_id}",
+            "reused": False,
+            "queue_position": None
+        }
+    
+    def _reuse_inflight(self, inflight_job: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the job reference for attaching to an identical job still in flight."""
+        queue_position = admission_controller.position(inflight_job["job_id"])
+        return {
+            **inflight_job,
+            "status": "queued" if queue_position is not None else inflight_job["status"],
+            "queue_position": queue_position,
+            "reused": True
+        }
+    
+    async def _execute_job(
+        self,
+        job_id: str,
+        df_clean: pd.DataFrame,
+        request: ModelTrainRequest,
+        problem_type: str,
+        model_filename: str,
+        start_time: float
+    ) -> Dict[str, Any]:
+        """Run a submitted training job and record its outcome on the job document."""
+        job_filter = {"_id": ObjectId(job_id)}
+        
+        try:
+            # Wait for memory and the user's job slots to free up
+            await admission_controller.wait(job_id)
+            
+            await self._update_job(job_filter, status="running", progress=0.1)
+            self._publish_event(job_id, start_time, {"stage": "running", "progress": 0.1})
+            
+            # Run PyCaret in a worker process so the event loop stays responsive
+            model_types = request.model_types or settings.PYCARET_LIGHTWEIGHT_MODELS
+            result = await training_pool.run(
+                run_training_pipeline,
+                df_clean,
+                request.target_column,
+                problem_type,
+                model_types,
+                request.user_id,
+                model_filename,
+                request.time_budget_seconds,
+                request.selection_strategy,
+                request.keep_top_n,
+                request.tune,
+                request.ensemble,
+                job_id=job_id,
+                on_event=lambda event: self._publish_event(job_id, start_time, event),
+                timeout=settings.TRAINING_HARD_TIMEOUT_SECONDS
+            )
+            metrics = result["metrics"]
+            plot_files = result["plot_files"]
+            # Plots not rendered yet are rendered on first request
+            plot_urls = PlotService.plot_urls(model_filename, problem_type)
+            
+            # Calculate training time
+            training_time = time.time() - start_time
+            
+            self._publish_event(job_id, start_time, {"stage": "completed", "progress": 1.0})
+            
+            # Store results on the job
+            await self._update_job(
+                job_filter,
+                status="completed",
+                progress=1.0,
+                events=job_tracker.events(job_id),
+                best_model=result["best_model"],
+                best_model_id=result["best_model_id"],
+                best_model_score=metrics.get('best_score', 0.0),
+                metrics=metrics,
+                leaderboard=result["leaderboard"],
+                candidate_filenames=result["candidate_filenames"],
+                tuning=result["tuning"],
+                ensemble=result["ensemble"],
+                plot_files=plot_files,
+                plot_filenames=list(plot_files.values()),
+                training_time=training_time
+            )
+            
+            logger.info(f"Training job {job_id} completed in {training_time:.1f}s")
+            
+            return self._build_result(
+                model_filename, request.dataset_name, request.target_column, problem_type,
+                result["best_model"], metrics, plot_urls, training_time, result["leaderboard"],
+                result["tuning"], result["ensemble"]
+            )
+            
+        except asyncio.CancelledError:
+            logger.info(f"Training job {job_id} cancelled")
+            self._publish_event(job_id, start_time, {"stage": "cancelled", "error": "Training was cancelled"})
+            await self._update_job(
+                job_filter,
+                status="cancelled",
+                error="Training was cancelled",
+                events=job_tracker.events(job_id)
+            )
+            FileManager.delete_file(settings.models_dir / model_filename)
+            raise
+        except Exception as e:
+            logger.error(f"Training job {job_id} failed: {e}")
+            self._publish_event(job_id, start_time, {"stage": "failed", "error": str(e)})
+            await self._update_job(
+                job_filter,
+                status="failed",
+                error=str(e),
+                events=job_tracker.events(job_id)
+            )
+            raise e
+        finally:
+            admission_controller.release(job_id)
+    
+    def _publish_event(self, job_id: str, start_time: float, event: Dict[str, Any]) -> None:
+        """Stamp a stage event with the elapsed job time and publish it."""
+        event = dict(event)
+        timestamp = event.pop("timestamp", None) or time.time()
+        event["elapsed"] = round(timestamp - start_time, 3)
+        job_tracker.publish(job_id, event)
+    
+    async def _update_job(self, job_filter: Dict[str, Any], **fields) -> None:
+        """Update fields on a model job document."""
+        try:
+            fields["updated_at"] = datetime.now(timezone.utc)
+            await self.db.update_document("model_jobs", job_filter, {"$set": fields})
+        except Exception as e:
+            logger.warning(f"Failed to update model job {job_filter}: {e}")
+    
+    def _build_result(
+        self,
+        model_filename: str,
+        dataset_name: str,
+        target_column: str,
+        problem_type: str,
+        best_model: str,
+        metrics: Dict[str, Any],
+        plot_urls: List[str],
+        training_time: float,
+        leaderboard: Optional[List[Dict[str, Any]]] = None,
+        tuning: Optional[Dict[str, Any]] = None,
+        ensemble: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Build the training result returned to API clients."""
+        # Generate download URL
+        download_url = f"/api/v1/models/download/{model_filename}"
+        
+        return {
+            "filename": model_filename,
+            "download_url": download_url,
+            "dataset_name": dataset_name,
+            "target_column": target_column,
+            "model_type": problem_type,
+            "best_model": best_model,
+            "best_model_score": metrics.get('best_score', 0.0),
+            "metrics": metrics,
+            "plot_urls": plot_urls,
+            "training_time": training_time,
+            "leaderboard": leaderboard or [],
+            "tuning": tuning,
+            "ensemble": ensemble
+        }
+    
+    async def get_job_status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Get status, progress and result of a training job."""
+        try:
+            if not ObjectId.is_valid(job_id):
+                return None
+            
+            model_jobs_collection = self.db.get_collection("model_jobs")
+            job_doc = await model_jobs_collection.find_one({"_id": ObjectId(job_id)})
+            
+            if not job_doc:
+                return None
+            
+            status = job_doc.get("status", "completed")
+            progress = job_doc.get("progress", 1.0)
+            stage = job_doc["events"][-1]["stage"] if job_doc.get("events") else None
+            
+            # Live progress of running jobs is kept in memory
+            latest_event = job_tracker.latest_event(job_id)
+            if latest_event:
+                progress = latest_event.get("progress", progress)
+                stage = latest_event["stage"]
+            
+            result = None
+            if status == "completed":
+                result = self._build_result(
+                    job_doc["filename"],
+                    job_doc["dataset_name"],
+                    job_doc["target_column"],
+                    job_doc["model_type"],
+                    job_doc.get("best_model"),
+                    job_doc.get("metrics", {}),
+                    PlotService.plot_urls(job_doc["filename"], job_doc["model_type"]),
+                    job_doc.get("training_time") or 0.0,
+                    job_doc.get("leaderboard"),
+                    job_doc.get("tuning"),
+                    job_doc.get("ensemble")
+                )
+            
+            return {
+                "job_id": job_id,
+                "status": status,
+                "progress": progress,
+                "stage": stage,
+                "queue_position": admission_controller.position(job_id),
+                "filename": job_doc["filename"],
+                "error": job_doc.get("error"),
+                "result": result
+            }
+            
+        except Exception as e:
+            logger.error(f"Failed to get training job {job_id}: {e}")
+            raise
+    
+    async def fail_interrupted_jobs(self) -> int:
+        """
+        Mark jobs left pending, queued or running without a live task as failed.
+
+        Jobs run as tasks of the API process, so a job document still in one of
+        these states after a crash or redeploy will never be finished.
+        """
+        error = "Training was interrupted by a server restart"
+        model_jobs_collection = self.db.get_collection("model_jobs")
+
+        job_ids = [
+            job_doc["_id"]
+            async for job_doc in model_jobs_collection.find(
+                {"status": {"$in": ["pending", "queued", "running"]}},
+                projection={"_id": 1}
+            )
+            if job_tracker.get(str(job_doc["_id"])) is None
+        ]
+        if not job_ids:
+            return 0
+
+        result = await model_jobs_collection.update_many(
+            {"_id": {"$in": job_ids}},
+            {
+                "$set": {"status": "failed", "error": error, "updated_at": datetime.now(timezone.utc)},
+                # Replayed event streams end on the failure instead of the last live stage
+                "$push": {"events": {"stage": "failed", "error": error}}
+            }
+        )
+        logger.warning(f"Marked {result.modified_count} interrupted training jobs as failed")
+        return result.modified_count
+
+    async def cancel_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Cancel a pending or running training job, killing its worker."""
+        try:
+            if not ObjectId.is_valid(job_id):
+                return None
+            
+            model_jobs_collection = self.db.get_collection("model_jobs")
+            job_doc = await model_jobs_collection.find_one({"_id": ObjectId(job_id)})
+            if not job_doc:
+                return None
+            
+            if not await job_tracker.cancel(job_id):
+                raise HTTPException(
+                    status_code=409,
+                    detail=f"Training job is already {job_doc.get('status', 'completed')}"
+                )
+            
+            return {"job_id": job_id, "status": "cancelled", "filename": job_doc["filename"]}
+            
+        except HTTPException:
+            raise
+        except Exception as e:
+            logger.error(f"Failed to cancel training job {job_id}: {e}")
+            raise
+    
+    async def stream_job_events(self, job_id: str) -> Optional[AsyncIterator[Dict[str, Any]]]:
+        """Get an iterator over the stage events of a training job."""
+        if job_tracker.get(job_id) is not None:
+            return self._follow_job_events(job_id)
+        
+        events = await self._persisted_job_events(job_id)
+        if events is None:
+            return None
+        
+        async def replay() -> AsyncIterator[Dict[str, Any]]:
+            for event in events:
+                yield event
+        
+        return replay()
+    
+    async def _follow_job_events(self, job_id: str) -> AsyncIterator[Dict[str, Any]]:
+        """Yield the live events of a running job, replaying persisted ones if it finished first."""
+        finished = False
+        async for event in job_tracker.subscribe(job_id):
+            yield event
+            finished = event["stage"] in job_tracker.TERMINAL_STAGES
+        
+        if not finished:
+            for event in await self._persisted_job_events(job_id) or []:
+                yield event
+    
+    async def _persisted_job_events(self, job_id: str) -> Optional[List[Dict[str, Any]]]:
+        """Get the stage events stored on a job document, None if the job does not exist."""
+        if not ObjectId.is_valid(job_id):
+            return None
+        
+        model_jobs_collection = self.db.get_collection("model_jobs")
+        job_doc = await model_jobs_collection.find_one({"_id": ObjectId(job_id)})
+        if not job_doc:
+            return None
+        
+        # Job is not running in this process, replay what was persisted
+        return job_doc.get("events") or [{
+            "stage": job_doc.get("status", "completed"),
+            "progress": job_doc.get("progress", 1.0)
+        }]
+    
+    def _run_pipeline(
+        self,
+        df_clean: pd.DataFrame,
+        target_column: str,
+        problem_type: str,
+        model_types: List[str],
+        user_id: str,
+        model_filename: str,
+        time_budget_seconds: Optional[float] = None,
+        selection_strategy: str = "full",
+        keep_top_n: int = 0,
+        tune: bool = False,
+        ensemble: str = "none"
+    ) -> Dict[str, Any]:
+        """Run PyCaret setup, model selection and artifact export synchronously."""
+        deadline = None
+        if time_budget_seconds is not None:
+            deadline = time.time() + time_budget_seconds
+        
+        sort = 'Accuracy' if problem_type == "classification" else 'MAE'
+        
+        # Race candidates on growing subsamples so only the leaders get full CV
+        if selection_strategy == "halving" and len(model_types) > settings.HALVING_TOP_K:
+            model_types = self._race_candidates(
+                df_clean, target_column, problem_type, model_types, sort, deadline
+            )
+        
+        # Setup PyCaret environment
+        experiment = self._setup_pycaret(df_clean, target_column, problem_type)
+        report_progress("setup_done", progress=0.2)
+        
+        # Candidates already cross-validated on this setup are taken from the cache
+        setup_key = self._setup_key(df_clean, target_column, problem_type)
+        cached_results = {}
+        for model_id in model_types:
+            cached = experiment_cache.get(self._candidate_key(setup_key, model_id, sort))
+            if cached is not None:
+                cached_results[model_id] = cached
+        remaining_types = [model_id for model_id in model_types if model_id not in cached_results]
+        
+        # Train models with limited selection for performance, reporting
+        # progress as each candidate finishes
+        candidates = {}
+        leaderboard_rows = []
+        
+        if settings.PARALLEL_CANDIDATES and len(remaining_types) > 1:
+            candidate_results = self._iter_candidates_parallel(
+                experiment, remaining_types, sort, deadline
+            )
+        else:
+            candidate_results = self._iter_candidates_sequential(
+                experiment, remaining_types, sort, deadline
+            )
+        cached_iter = ((model_id, "finished", model, row) for model_id, (model, row) in cached_results.items())
+        
+        for index, (model_id, status, model, row) in enumerate(chain(cached_iter, candidate_results), start=1):
+            progress = 0.2 + 0.6 * index / len(model_types)
+            
+            if status != "finished":
+                report_progress(f"candidate_{status}", progress=progress, model_id=model_id)
+                continue
+            
+            if model_id not in cached_results:
+                experiment_cache.put(self._candidate_key(setup_key, model_id, sort), (model, row))
+            
+            candidates[model_id] = model
+            leaderboard_rows.append(row)
+            report_progress(
+                "candidate_finished",
+                progress=progress,
+                model_id=model_id,
+                model_name=str(row.iloc[0].get('Model', model_id)),
+                score=float(row.iloc[0][sort]),
+                cached=model_id in cached_results
+            )
+        
+        if not leaderboard_rows:
+            raise ValueError("None of the candidate models could be trained on this dataset")
+        
+        # Rank candidates by the sort metric, as compare_models does
+        leaderboard = pd.concat(leaderboard_rows).sort_values(
+            sort, ascending=self._is_loss_metric(sort)
+        )
+        best_model = candidates[leaderboard.index[0]]
+        
+        # Get model metrics
+        metrics = self._extract_model_metrics(leaderboard, problem_type)
+        
+        # Tune the selected model within a bounded budget, keeping it only if CV improves
+        tuning = None
+        if tune:
+            best_model, tuning, tuned_row = self._tune_candidate(
+                experiment, best_model, sort, float(leaderboard.iloc[0][sort]), deadline
+            )
+            if tuned_row is not None:
+                candidates[leaderboard.index[0]] = best_model
+                metrics = self._extract_model_metrics(tuned_row, problem_type)
+                # Rank 1 is the tuned model now, so it is listed with its CV scores
+                tuned_columns = leaderboard.columns.intersection(tuned_row.columns)
+                leaderboard.loc[leaderboard.index[0], tuned_columns] = tuned_row.iloc[0][tuned_columns].values
+        
+        # Finalize model
+        final_model = experiment.finalize_model(best_model)
+        report_progress("model_finalized", progress=0.85)
+        
+        model_filepath = settings.models_dir / model_filename
+        # Ensure the models directory exists
+        model_filepath.parent.mkdir(parents=True, exist_ok=True)
+        # Save model
+        with open(model_filepath, 'wb') as f:
+            pickle.dump(final_model, f)
+        report_progress("model_saved", progress=0.9)
+        
+        leaderboard_entries = self._build_leaderboard(leaderboard, candidates, problem_type)
+        
+        # Keep finalized runners-up so they can be promoted without retraining
+        candidate_filenames = {}
+        finalized = {leaderboard.index[0]: final_model}
+        for model_id in leaderboard.index[1:1 + keep_top_n]:
+            candidate_filename = NamingUtils.generate_candidate_filename(model_filename, model_id)
+            finalized[model_id] = experiment.finalize_model(candidates[model_id])
+            with open(settings.models_dir / candidate_filename, 'wb') as f:
+                pickle.dump(finalized[model_id], f)
+            candidate_filenames[model_id] = candidate_filename
+            report_progress("candidate_saved", model_id=model_id)
+        
+        # Blend or stack the top candidates, kept as a candidate that can be promoted
+        ensemble_info = None
+        if ensemble == "top3":
+            ensemble_info = self._build_ensemble(
+                experiment, setup_key, leaderboard, candidates, finalized, problem_type, model_filename, deadline
+            )
+            if ensemble_info is not None and "skipped" in ensemble_info:
+                report_progress("ensemble_skipped", reason=ensemble_info["skipped"])
+            elif ensemble_info is not None:
+                candidate_filenames[ENSEMBLE_MODEL_ID] = ensemble_info["filename"]
+                report_progress("ensemble_saved", method=ensemble_info["method"], score=ensemble_info["cv_score"])
+        
+        # Keep the dataset and unfinalized models so plots can be rendered later
+        PlotService.save_snapshot(
+            model_filename,
+            df_clean,
+            target_column,
+            problem_type,
+            {model_id: candidates[model_id] for model_id in leaderboard.index[:1 + keep_top_n]}
+        )
+        
+        # Generate evaluation plots now only when eager rendering is configured
+        plot_files = {}
+        plot_types = PlotService.plot_types(problem_type)
+        if settings.EAGER_PLOTS and settings.PARALLEL_PLOTS and len(plot_types) > 1:
+            plot_files = PlotService.render_plots_parallel(
+                experiment,
+                best_model,
+                user_id,
+                model_filename.split('.')[0],
+                plot_types
+            )
+        elif settings.EAGER_PLOTS:
+            plot_files = PlotService.render_plots(
+                experiment,
+                best_model,
+                user_id,
+                model_filename.split('.')[0],
+                plot_types
+            )
+        
+        return {
+            "best_model": str(type(best_model).__name__),
+            "best_model_id": leaderboard.index[0],
+            "metrics": metrics,
+            "leaderboard": leaderboard_entries,
+            "candidate_filenames": candidate_filenames,
+            "tuning": tuning,
+            "ensemble": ensemble_info,
+            "plot_files": plot_files
+        }
+    
+    def _setup_pycaret(self, df_clean: pd.DataFrame, target_column: str, problem_type: str, n_jobs: int = -1):
+        """Create a PyCaret experiment for the problem type, or restore a cached one."""
+        # Each job gets its own experiment object instead of the module-level
+        # functional API, so jobs sharing a process do not share state
+        setup_key = self._setup_key(df_clean, target_column, problem_type, n_jobs)
+        experiment = experiment_cache.get_experiment(setup_key)
+        if experiment is not None:
+            return experiment
+        
+        experiment = ClassificationExperiment() if problem_type == "classification" else RegressionExperiment()
+        experiment.setup(
+            df_clean,
+            target=target_column,
+            verbose=False,
+            n_jobs=n_jobs,
+            **self.SETUP_PARAMS
+        )
+        experiment_cache.put_experiment(setup_key, experiment)
+        return experiment
+    
+    def _setup_key(self, df_clean: pd.DataFrame, target_column: str, problem_type: str, n_jobs: int = -1) -> str:
+        """Cache key of a prepared experiment: dataset content, target and setup parameters."""
+        return experiment_cache.make_key(
+            "setup",
+            dataset=experiment_cache.dataset_hash(df_clean),
+            target_column=target_column,
+            problem_type=problem_type,
+            n_jobs=n_jobs,
+            **self.SETUP_PARAMS
+        )
+    
+    def _candidate_key(self, setup_key: str, model_id: str, sort: str) -> str:
+        """Cache key of a cross-validated candidate on a prepared experiment."""
+        return experiment_cache.make_key("candidate", setup=setup_key, model_id=model_id, sort=sort)
+    
+    def _race_candidates(
+        self,
+        df_clean: pd.DataFrame,
+        target_column: str,
+        problem_type: str,
+        model_types: List[str],
+        sort: str,
+        deadline: Optional[float]
+    ) -> List[str]:
+        """
+        Successive halving: score candidates on a small subsample, keep the better
+        half and repeat on a sample twice as large until only the top-k remain.
+        """
+        survivors = list(model_types)
+        sample_rows = settings.HALVING_MIN_SAMPLE_ROWS
+        round_number = 0
+        
+        while len(survivors) > settings.HALVING_TOP_K and sample_rows < len(df_clean):
+            if deadline is not None and time.time() >= deadline:
+                break
+            round_number += 1
+            
+            sample = self._stratified_sample(df_clean, target_column, problem_type, sample_rows)
+            experiment = self._setup_pycaret(sample, target_column, problem_type)
+            
+            scores = {}
+            for model_id in survivors:
+                model, row = self._evaluate_candidate(
+                    experiment, model_id, sort, fold=settings.HALVING_FOLDS
+                )
+                if model is not None:
+                    scores[model_id] = float(row.iloc[0][sort])
+            
+            # Keep candidates that failed on the sample out of later rounds
+            ranked = sorted(scores, key=scores.get, reverse=not self._is_loss_metric(sort))
+            survivors = ranked[:max(settings.HALVING_TOP_K, len(ranked) // 2)] or survivors
+            
+            report_progress(
+                "halving_round",
+                round=round_number,
+                sample_rows=len(sample),
+                scores=scores,
+                survivors=survivors
+            )
+            sample_rows *= 2
+        
+        return survivors[:settings.HALVING_TOP_K] if round_number else survivors
+    
+    def _stratified_sample(
+        self,
+        df: pd.DataFrame,
+        target_column: str,
+        problem_type: str,
+        n_rows: int
+    ) -> pd.DataFrame:
+        """Sample rows, keeping class proportions and every class for classification."""
+        if problem_type != "classification":
+            return DatasetSampler.sample_frame(df, n_rows)
+        
+        # Rare classes keep enough rows for stratified cross-validation
+        return DatasetSampler.sample_frame(df, n_rows, target_column, settings.HALVING_FOLDS)
+    
+    def _iter_candidates_sequential(
+        self,
+        experiment,
+        model_types: List[str],
+        sort: str,
+        deadline: Optional[float]
+    ) -> Iterator[Tuple[str, str, Any, Optional[pd.DataFrame]]]:
+        """Evaluate candidates one after another in this process."""
+        evaluated = False
+        
+        for model_id in model_types:
+            # Stop the search once the budget is spent, keeping what was evaluated
+            if deadline is not None and evaluated and time.time() >= deadline:
+                yield model_id, "skipped", None, None
+                continue
+            
+            model, row = self._evaluate_candidate(experiment, model_id, sort)
+            evaluated = evaluated or model is not None
+            yield model_id, "finished" if model is not None else "failed", model, row
+    
+    def _iter_candidates_parallel(
+        self,
+        experiment,
+        model_types: List[str],
+        sort: str,
+        deadline: Optional[float]
+    ) -> Iterator[Tuple[str, str, Any, Optional[pd.DataFrame]]]:
+        """
+        Evaluate each candidate in its own worker process, yielding results as they finish.
+        
+        Workers receive this prepared experiment instead of running setup
+        themselves, so every candidate is fitted on the same preprocessed
+        data and CV folds.
+        """
+        # Serialized once, PyCaret would otherwise leave the dataset out
+        experiment_payload = ExperimentCache.dumps_experiment(experiment)
+        executor = open_process_pool(min(len(model_types), settings.CANDIDATE_MAX_WORKERS))
+        
+        pending = set()
+        
+        try:
+            futures = {
+                executor.submit(
+                    evaluate_candidate_in_worker, experiment_payload, model_id, sort
+                ): model_id
+                for model_id in model_types
+            }
+            pending = set(futures)
+            evaluated = False
+            
+            while pending:
+                timeout = None
+                if deadline is not None and evaluated:
+                    timeout = max(0.0, deadline - time.time())
+                
+                done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+                
+                # Budget spent, drop candidates that have not finished
+                if not done:
+                    for future in pending:
+                        yield futures[future], "skipped", None, None
+                    return
+                
+                for future in done:
+                    model_id = futures[future]
+                    try:
+                        model, row = future.result()
+                    except Exception as e:
+                        logger.warning(f"Candidate worker for {model_id} failed: {e}")
+                        model, row = None, None
+                    
+                    evaluated = evaluated or model is not None
+                    yield model_id, "finished" if model is not None else "failed", model, row
+        finally:
+            # Shutdown only cancels candidates that have not started; running ones
+            # would be joined at exit, so the job would wait for the slowest of them
+            if pending:
+                kill_executor_processes(executor)
+            executor.shutdown(wait=False, cancel_futures=True)
+    
+    def _evaluate_candidate(
+        self,
+        experiment,
+        model_id: str,
+        sort: str,
+        fold: Optional[int] = None
+    ) -> Tuple[Any, Optional[pd.DataFrame]]:
+        """Cross-validate a single candidate and return it with its leaderboard row."""
+        try:
+            model = experiment.compare_models(
+                include=[model_id],
+                fold=fold,
+                turbo=settings.PYCARET_TURBO_MODE,
+                sort=sort,
+                n_select=1,
+                verbose=False
+            )
+        except Exception as e:
+            logger.warning(f"Failed to train candidate {model_id}: {e}")
+            return None, None
+        
+        # compare_models returns an empty list when the candidate errored
+        if isinstance(model, list):
+            model = model[0] if model else None
+        if model is None:
+            return None, None
+        
+        return model, experiment.pull().iloc[[0]]
+    
+    def _tune_candidate(
+        self,
+        experiment,
+        model,
+        sort: str,
+        baseline_score: float,
+        deadline: Optional[float]
+    ) -> Tuple[Any, Dict[str, Any], Optional[pd.DataFrame]]:
+        """
+        Tune a model in short random-search rounds and return the best model found,
+        a tuning summary and the CV mean row of the tuned model (None if the
+        untuned model was not beaten).
+        
+        Each round samples TUNING_N_ITER new parameter sets. Tuning stops after
+        TUNING_PATIENCE rounds without improvement, after TUNING_MAX_ROUNDS rounds
+        or once the time budget is spent; a round in progress is not interrupted.
+        """
+        tuning_deadline = time.time() + settings.TUNING_TIME_BUDGET_SECONDS
+        if deadline is not None:
+            tuning_deadline = min(tuning_deadline, deadline)
+        
+        best_model, best_score, best_row = model, baseline_score, None
+        rounds = 0
+        stale_rounds = 0
+        base_seed = experiment.seed
+        
+        try:
+            while rounds < settings.TUNING_MAX_ROUNDS and stale_rounds < settings.TUNING_PATIENCE:
+                if time.time() >= tuning_deadline:
+                    break
+                rounds += 1
+                
+                # The random search is seeded from the experiment, so vary it per round
+                experiment.seed = base_seed + rounds
+                try:
+                    tuned = experiment.tune_model(
+                        model,
+                        n_iter=settings.TUNING_N_ITER,
+                        optimize=sort,
+                        choose_better=False,
+                        verbose=False
+                    )
+                    results = experiment.pull()
+                except Exception as e:
+                    logger.warning(f"Tuning round {rounds} failed: {e}")
+                    break
+                
+                score = float(results.loc["Mean", sort])
+                improved = score < best_score if self._is_loss_metric(sort) else score > best_score
+                if improved:
+                    best_model, best_score, best_row = tuned, score, results.loc[["Mean"]]
+                    stale_rounds = 0
+                else:
+                    stale_rounds += 1
+                
+                report_progress("tuning_round", round=rounds, score=score, best_score=best_score, improved=improved)
+        finally:
+            experiment.seed = base_seed
+        
+        tuning = {
+            "rounds": rounds,
+            "baseline_score": baseline_score,
+            "tuned_score": best_score,
+            "improved": best_row is not None
+        }
+        return best_model, tuning, best_row
+    
+    def _build_ensemble(
+        self,
+        experiment,
+        setup_key: str,
+        leaderboard: pd.DataFrame,
+        candidates: Dict[str, Any],
+        finalized: Dict[str, Any],
+        problem_type: str,
+        model_filename: str,
+        deadline: Optional[float] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Blend or stack the top candidates and save the ensemble next to the model.
+        
+        Out-of-fold predictions are cached per candidate, so the blend and the
+        stacking meta-model are chosen and fitted on them without cross-validating
+        the members again. PyCaret's CV does not expose its out-of-fold
+        predictions, so members without cached ones are cross-validated once
+        more, but only while the time budget lasts. Returns the ensemble
+        summary, a summary with the reason it was skipped, or None if it could
+        not be built.
+        """
+        # Classification members must give class probabilities to be combined
+        member_ids = [
+            model_id for model_id in leaderboard.index
+            if problem_type != "classification" or hasattr(candidates[model_id], "predict_proba")
+        ][:settings.ENSEMBLE_TOP_N]
+        if len(member_ids) < 2:
+            logger.warning("Not enough compatible candidates to build an ensemble")
+            return None
+        
+        try:
+            oof = []
+            oof_refits = 0
+            for model_id in member_ids:
+                oof_key = experiment_cache.make_key(
+                    "oof",
+                    setup=setup_key,
+                    model_id=model_id,
+                    params=candidates[model_id].get_params(),
+                    preprocessing="per_fold"
+                )
+                predictions = experiment_cache.get(oof_key)
+                if predictions is None:
+                    if deadline is not None and time.time() >= deadline:
+                        logger.info("Time budget spent, skipping the ensemble")
+                        return {
+                            "skipped": "time budget spent before out-of-fold predictions of all members",
+                            "members": member_ids,
+                            "oof_refits": oof_refits
+                        }
+                    predictions = EnsembleBuilder.oof_predictions(experiment, candidates[model_id], problem_type)
+                    experiment_cache.put(oof_key, predictions)
+                    oof_refits += 1
+                oof.append(predictions)
+            
+            y_true = np.asarray(experiment.get_config("y_train_transformed"))
+            method, cv_score, meta_model = EnsembleBuilder.select(
+                oof, y_true, problem_type, experiment.get_config("fold_generator")
+            )
+            
+            members = {}
+            for model_id in member_ids:
+                if model_id not in finalized:
+                    finalized[model_id] = experiment.finalize_model(candidates[model_id])
+                members[model_id] = finalized[model_id]
+            
+            # Class probabilities are ordered like the sorted original labels
+            classes = None
+            if problem_type == "classification":
+                classes = np.unique(np.asarray(experiment.get_config("y_train")))
+            
+            ensemble_filename = NamingUtils.generate_candidate_filename(model_filename, ENSEMBLE_MODEL_ID)
+            with open(settings.models_dir / ensemble_filename, 'wb') as f:
+                pickle.dump(EnsembleModel(members, problem_type, method, classes, meta_model), f)
+            
+        except Exception as e:
+            logger.warning(f"Failed to build ensemble of {member_ids}: {e}")
+            return None
+        
+        return {
+            "method": method,
+            "members": member_ids,
+            "metric": 'Accuracy' if problem_type == "classification" else 'MAE',
+            "cv_score": cv_score,
+            # Pooled out-of-fold score of the best member, comparable to cv_score
+            "best_member_cv_score": EnsembleBuilder.score(y_true, oof[0], problem_type),
+            # Members cross-validated again for their out-of-fold predictions
+            "oof_refits": oof_refits,
+            "filename": ensemble_filename
+        }
+    
+    @staticmethod
+    def _is_loss_metric(metric: str) -> bool:
+        """Check whether lower values of a metric are better."""
+        return metric in ('MAE', 'MSE', 'RMSE', 'RMSLE', 'MAPE')
+    
     async def predict(self, request: PredictionRequest) -> Dict[str, Any]:
         """Make predictions using a trained model."""
         try:
-            # Find model file
-            model_filepath = settings.models_dir / request.model_filename
-            if not model_filepath.exists():
-                raise HTTPException(status_code=404, detail="Model file not found")
-            
-            # Load model
-            with open(model_filepath, 'rb') as f:
-                model = pickle.load(f)
+            model = await self._load_prediction_model(request.model_filename)
             
             # Convert input data to DataFrame
             input_df = pd.DataFrame([request.input_data])
             
-            # Make predictions
-            predictions = model.predict(input_df).tolist()
+            # Validate input against the profile of the training dataset
+            await self._validate_prediction_input(request.model_filename, input_df)
             
-            # Try to get prediction probabilities (classification only)
-            prediction_probabilities = None
-            try:
-                if hasattr(model, 'predict_proba'):
-                    proba = model.predict_proba(input_df)
-                    prediction_probabilities = proba.tolist()
-            except Exception:
-                pass  # Probabilities not available
+            # Make predictions, batched with concurrent requests for the same model
+            predictions, prediction_probabilities = await prediction_batcher.submit(
+                request.model_filename, model, input_df, self._score
+            )
             
             # Store prediction in database
             prediction_record = Prediction(
@@ -213,15 +1130,189 @@ class TrainService:
             logger.error(f"Prediction failed: {e}")
             raise e
     
-    def _determine_problem_type(self, df: pd.DataFrame, target_column: str) -> str:
-        """Determine if problem is classification or regression."""
-        target_series = df[target_column]
+    async def predict_batch(self, request: BatchPredictionRequest) -> Dict[str, Any]:
+        """Score many rows with one vectorized call through the model pipeline."""
+        try:
+            # Build one DataFrame from either input layout
+            if request.records is not None:
+                input_df = pd.DataFrame.from_records(request.records)
+            else:
+                input_df = pd.DataFrame(request.columns)
+            
+            if len(input_df) > settings.MAX_BATCH_PREDICTION_ROWS:
+                raise HTTPException(
+                    status_code=413,
+                    detail=f"Too many rows in batch. Max: {settings.MAX_BATCH_PREDICTION_ROWS}"
+                )
+            
+            model = await self._load_prediction_model(request.model_filename)
+            await self._validate_prediction_input(request.model_filename, input_df)
+            
+            # Score on the inference pool, a large batch takes a while
+            predictions, prediction_probabilities = await inference_pool.run(
+                request.model_filename, self._score, model, input_df
+            )
+            
+            # Record the call only, the rows can exceed the document size limit
+            batch_record = BatchPrediction(
+                user_id=request.user_id,
+                model_filename=request.model_filename,
+                batch_rows=len(input_df)
+            )
+            predictions_collection = self.db.get_collection("predictions")
+            await predictions_collection.insert_one(batch_record.model_dump(by_alias=True))
+            
+            return {
+                "predictions": predictions,
+                "prediction_probabilities": prediction_probabilities,
+                "model_filename": request.model_filename,
+                "rows": len(input_df)
+            }
+            
+        except Exception as e:
+            logger.error(f"Batch prediction failed: {e}")
+            raise e
+    
+    async def _load_prediction_model(self, model_filename: str):
+        """Get a trained model for predictions, reusing it from memory when it was used before."""
+        model_filepath = settings.models_dir / model_filename
+        if not model_filepath.exists():
+            raise HTTPException(status_code=404, detail="Model file not found")
+        
+        # Unpickling a model that is not cached takes a while, so it runs on the inference pool
+        return await inference_pool.run(model_filename, model_cache.get, model_filepath)
+    
+    @staticmethod
+    def _score(model, input_df: pd.DataFrame) -> Tuple[List[Any], Optional[List[List[float]]]]:
+        """Predict all rows of a DataFrame, with class probabilities where the model has them."""
+        predictions = model.predict(input_df).tolist()
+        
+        # Try to get prediction probabilities (classification only)
+        prediction_probabilities = None
+        try:
+            if hasattr(model, 'predict_proba'):
+                proba = model.predict_proba(input_df)
+                prediction_probabilities = proba.tolist()
+        except Exception:
+            pass  # Probabilities not available
+        
+        return predictions, prediction_probabilities
+    
+    async def score_csv(self, file: UploadFile, user_id: str, model_filename: str) -> AsyncIterator[str]:
+        """
+        Save an uploaded CSV and return an iterator streaming it back with predictions appended.
+        
+        The file is read and scored PREDICT_CSV_CHUNK_ROWS rows at a time, so memory
+        does not grow with its size. Problems found in the first chunk are raised
+        here, before any output is sent; a later chunk that fails to score ends
+        the stream early. The saved file is deleted once the stream ends.
+        """
+        temp_filename = NamingUtils.generate_temp_filename(user_id, file.filename)
+        temp_filepath = settings.storage_dir / "temp" / temp_filename
+        reader = None
+        
+        try:
+            model = await self._load_prediction_model(model_filename)
+            expected_input = await self._expected_prediction_input(model_filename)
+            
+            await FileManager.save_uploaded_file(file, temp_filepath)
+            reader = pd.read_csv(temp_filepath, chunksize=settings.PREDICT_CSV_CHUNK_ROWS)
+            first_chunk = await asyncio.to_thread(next, reader, None)
+            if first_chunk is None:
+                raise HTTPException(status_code=400, detail="CSV file has no data rows")
+            if expected_input:
+                ProfileService.validate_input(*expected_input, first_chunk)
+            
+        except pd.errors.EmptyDataError:
+            self._close_scoring_file(reader, temp_filepath)
+            raise HTTPException(status_code=400, detail="CSV file is empty")
+        except Exception:
+            self._close_scoring_file(reader, temp_filepath)
+            raise
+        
+        async def stream() -> AsyncIterator[str]:
+            rows = 0
+            chunk = first_chunk
+            try:
+                while chunk is not None:
+                    if rows and expected_input:
+                        ProfileService.validate_input(*expected_input, chunk)
+                    scored = await inference_pool.run(model_filename, self._score_chunk, model, chunk)
+                    yield scored.to_csv(index=False, header=rows == 0)
+                    rows += len(chunk)
+                    chunk = await asyncio.to_thread(next, reader, None)
+                
+                # Record the call only, like batch predictions
+                batch_record = BatchPrediction(user_id=user_id, model_filename=model_filename, batch_rows=rows)
+                predictions_collection = self.db.get_collection("predictions")
+                await predictions_collection.insert_one(batch_record.model_dump(by_alias=True))
+                logger.info(f"Scored {rows} CSV rows with model {model_filename}")
+                
+            except Exception as e:
+                logger.error(f"CSV scoring with model {model_filename} stopped after {rows} rows: {e}")
+                raise
+            finally:
+                self._close_scoring_file(reader, temp_filepath)
+        
+        return stream()
+    
+    def _score_chunk(self, model, chunk: pd.DataFrame) -> pd.DataFrame:
+        """Append the prediction and class probability columns to a chunk of input rows."""
+        predictions, prediction_probabilities = self._score(model, chunk)
+        scored = chunk.assign(prediction=predictions)
+        if prediction_probabilities is not None:
+            probabilities = np.asarray(prediction_probabilities)
+            for index in range(probabilities.shape[1]):
+                scored[f"probability_{index}"] = probabilities[:, index]
+        return scored
+    
+    @staticmethod
+    def _close_scoring_file(reader, filepath: Path) -> None:
+        if reader is not None:
+            reader.close()
+        if filepath.exists():
+            FileManager.delete_file(filepath)
+    
+    async def _expected_prediction_input(self, model_filename: str) -> Optional[Tuple[Dict[str, Any], List[str]]]:
+        """
+        Get the training dataset profile and feature names of a model, if they were recorded.
+        
+        They are kept with the model in the model cache, so they are only looked
+        up again once the model is evicted or replaced.
+        """
+        metadata = model_cache.get_metadata(model_filename)
+        if metadata is not None:
+            return metadata["expected_input"]
+        
+        expected_input = None
+        model_jobs_collection = self.db.get_collection("model_jobs")
+        model_doc = await model_jobs_collection.find_one(
+            {"filename": model_filename},
+            projection={"feature_names": 1, "dataset_sha256": 1}
+        )
+        if model_doc and model_doc.get("dataset_sha256"):
+            profile = await ProfileService().get_profile(model_doc["dataset_sha256"])
+            if profile:
+                expected_input = profile, model_doc.get("feature_names") or []
+        
+        model_cache.put_metadata(model_filename, {"expected_input": expected_input})
+        return expected_input
+    
+    async def _validate_prediction_input(self, model_filename: str, input_df: pd.DataFrame) -> None:
+        """Check prediction input against the stored profile of the model's training dataset."""
+        expected_input = await self._expected_prediction_input(model_filename)
+        if expected_input:
+            ProfileService.validate_input(*expected_input, input_df)
+    
+    def _determine_problem_type(self, profile: Dict[str, Any], target_column: str) -> str:
+        """Determine if problem is classification or regression from the dataset profile."""
+        target_stats = profile["target_stats"][target_column]
         
         # Check if target is numeric
-        if pd.api.types.is_numeric_dtype(target_series):
+        if target_stats["is_numeric"]:
             # Check number of unique values
-            unique_count = target_series.nunique()
-            total_count = len(target_series)
+            unique_count = target_stats["n_unique"]
+            total_count = target_stats["rows"]
             
             # If unique values are less than 10% of total or less than 20, treat as classification
             if unique_count <= 20 or (unique_count / total_count) < 0.1:
@@ -239,36 +1330,34 @@ class TrainService:
         # Remove rows with missing target values
         df_clean = df_clean.dropna(subset=[target_column])
         
-        # Limit dataset size if too large
-        if len(df_clean) > settings.MAX_DATASET_ROWS:
-            df_clean = df_clean.sample(n=settings.MAX_DATASET_ROWS, random_state=42)
+        # No resampling here: the upload was already sampled to the cell budget when
+        # read, and rare classes kept there on purpose may exceed the budget
         
         return df_clean
     
-    def _extract_model_metrics(self, pycaret_module, problem_type: str) -> Dict[str, Any]:
-        """Extract metrics from PyCaret model."""
+    def _extract_model_metrics(self, metrics_df: pd.DataFrame, problem_type: str, position: int = 0) -> Dict[str, Any]:
+        """Extract metrics of a model from the ranked leaderboard (the best one by default)."""
         try:
-            # Pull metrics from PyCaret
-            metrics_df = pycaret_module.pull()
+            row = metrics_df.iloc[position]
             
             if problem_type == "classification":
-                best_score = float(metrics_df.iloc[0]['Accuracy'])
+                best_score = float(row['Accuracy'])
                 metrics = {
                     'best_score': best_score,
-                    'accuracy': float(metrics_df.iloc[0]['Accuracy']),
-                    'precision': float(metrics_df.iloc[0]['Prec.']),
-                    'recall': float(metrics_df.iloc[0]['Recall']),
-                    'f1': float(metrics_df.iloc[0]['F1']),
-                    'auc': float(metrics_df.iloc[0]['AUC'])
+                    'accuracy': float(row['Accuracy']),
+                    'precision': float(row['Prec.']),
+                    'recall': float(row['Recall']),
+                    'f1': float(row['F1']),
+                    'auc': float(row['AUC'])
                 }
             else:
-                best_score = float(metrics_df.iloc[0]['MAE'])
+                best_score = float(row['MAE'])
                 metrics = {
                     'best_score': best_score,
-                    'mae': float(metrics_df.iloc[0]['MAE']),
-                    'mse': float(metrics_df.iloc[0]['MSE']),
-                    'rmse': float(metrics_df.iloc[0]['RMSE']),
-                    'r2': float(metrics_df.iloc[0]['R2'])
+                    'mae': float(row['MAE']),
+                    'mse': float(row['MSE']),
+                    'rmse': float(row['RMSE']),
+                    'r2': float(row['R2'])
                 }
             
             return metrics
@@ -277,53 +1366,58 @@ class TrainService:
             logger.warning(f"Failed to extract metrics: {e}")
             return {"best_score": 0.0}
     
-    async def _generate_evaluation_plots(
-        self, 
-        pycaret_module, 
-        user_id: str, 
-        model_name: str, 
+    def _build_leaderboard(
+        self,
+        leaderboard: pd.DataFrame,
+        candidates: Dict[str, Any],
         problem_type: str
-    ) -> List[str]:
-        """Generate evaluation plots using PlotService."""
-        try:
-            plot_types = []
-            
-            if problem_type == "classification":
-                plot_types = ['confusion_matrix', 'class_report', 'roc']
-            else:
-                plot_types = ['residuals', 'prediction_error']
-            
-            plot_urls = []
-            
-            for plot_type in plot_types:
-                try:
-                    # Generate plot using PyCaret
-                    pycaret_module.plot_model(
-                        pycaret_module.pull().index[0],  # Best model
-                        plot=plot_type,
-                        save=True,
-                        verbose=False
-                    )
-                    
-                    # Move and rename the saved plot
-                    plot_filename = NamingUtils.generate_plot_filename(
-                        user_id, model_name, plot_type
-                    )
-                    
-                    # PyCaret saves plots as PNG files in current directory
-                    source_plot = Path(f"{plot_type}.png")
-                    target_plot = settings.plots_dir / plot_filename
-                    
-                    if source_plot.exists():
-                        source_plot.rename(target_plot)
-                        plot_url = f"/api/v1/plots/view/{plot_filename}"
-                        plot_urls.append(plot_url)
-                    
-                except Exception as plot_error:
-                    logger.warning(f"Failed to generate {plot_type} plot: {plot_error}")
-            
-            return plot_urls
-            
-        except Exception as e:
-            logger.warning(f"Failed to generate evaluation plots: {e}")
-            return []
\ No newline at end of file
+    ) -> List[Dict[str, Any]]:
+        """Convert the ranked leaderboard into documents with CV metrics and fit time."""
+        entries = []
+        for position, model_id in enumerate(leaderboard.index):
+            row = leaderboard.iloc[position]
+            entries.append({
+                "rank": position + 1,
+                "model_id": model_id,
+                "model_name": str(type(candidates[model_id]).__name__),
+                "metrics": self._extract_model_metrics(leaderboard, problem_type, position),
+                "fit_time": float(row.get('TT (Sec)', 0.0))
+            })
+        return entries
+
+
+def evaluate_candidate_in_worker(
+    experiment_payload: bytes,
+    model_id: str,
+    sort: str
+) -> Tuple[Any, Optional[pd.DataFrame]]:
+    """Entry point for candidate evaluation worker processes."""
+    experiment = ExperimentCache.loads_experiment(experiment_payload)
+    
+    # One core per candidate since the candidates already run side by side
+    # (gpu_n_jobs_param is derived from n_jobs_param); model containers
+    # capture n_jobs when they are built, so rebuild them
+    experiment.n_jobs_param = 1
+    experiment._all_models, experiment._all_models_internal = experiment._get_models()
+    
+    return TrainService()._evaluate_candidate(experiment, model_id, sort)
+
+
+def run_training_pipeline(
+    df_clean: pd.DataFrame,
+    target_column: str,
+    problem_type: str,
+    model_types: List[str],
+    user_id: str,
+    model_filename: str,
+    time_budget_seconds: Optional[float] = None,
+    selection_strategy: str = "full",
+    keep_top_n: int = 0,
+    tune: bool = False,
+    ensemble: str = "none"
+) -> Dict[str, Any]:
+    """Entry point for training worker processes."""
+    return TrainService()._run_pipeline(
+        df_clean, target_column, problem_type, model_types, user_id, model_filename,
+        time_budget_seconds, selection_strategy, keep_top_n, tune, ensemble
+    )
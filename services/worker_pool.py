@@ -0,0 +1,341 @@
+"""
+Worker pool for CPU-bound training jobs, running each job in a process or a thread.
+"""
+
+import asyncio
+import importlib
+import logging
+import multiprocessing
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Set
+
+import psutil
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+# Modules imported into workers before jobs arrive
+PRELOAD_MODULES = ['services.worker_preload']
+
+# Set while warm_up() starts the fork server, so only that server runs the warm-up fit
+WARMUP_FIT_ENV = "AUTOML_WORKER_WARMUP_FIT"
+
+# Progress event sender of the job running on the current thread, set by the pool
+_progress = threading.local()
+_progress_lock = threading.Lock()
+
+# Whether this is a worker process, whose modules are already imported
+_in_worker = False
+
+
+def report_progress(stage: str, **details) -> None:
+    """Send a progress event from a running job to the pool (no-op outside a job)."""
+    send = getattr(_progress, "send", None)
+    if send is None:
+        return
+    send({"stage": stage, "timestamp": time.time(), **details})
+
+
+def _kill_process_tree(process: multiprocessing.Process) -> None:
+    """Kill a worker process together with any processes it started."""
+    try:
+        children = psutil.Process(process.pid).children(recursive=True)
+    except psutil.NoSuchProcess:
+        children = []
+    for child in children:
+        try:
+            child.kill()
+        except psutil.NoSuchProcess:
+            pass
+    process.kill()
+
+
+def kill_executor_processes(executor: ProcessPoolExecutor) -> None:
+    """Kill the worker processes of a process pool, including tasks still running in them."""
+    for process in list((executor._processes or {}).values()):
+        if process.is_alive():
+            _kill_process_tree(process)
+
+
+def _clear_progress() -> None:
+    _progress.send = None
+
+
+def open_process_pool(max_workers: int) -> ProcessPoolExecutor:
+    """
+    Open a process pool for a job to spread its work over.
+
+    Inside a worker process the pool processes are forked from the worker,
+    whose modules are already imported, instead of from a new fork server
+    that would import them all over again for every job.
+    """
+    start_method = settings.TRAINING_START_METHOD
+    if _in_worker and "fork" in multiprocessing.get_all_start_methods():
+        start_method = "fork"
+    # Forked processes would otherwise inherit the job's progress sender
+    return ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=multiprocessing.get_context(start_method),
+        initializer=_clear_progress
+    )
+
+
+def _worker_entrypoint(conn, func: Callable, args: tuple, kwargs: dict) -> None:
+    """Run a job inside the worker process and send the outcome to the parent."""
+    global _in_worker
+    _in_worker = True
+
+    def send(event: Dict[str, Any]) -> None:
+        with _progress_lock:
+            conn.send(("event", event))
+
+    _progress.send = send
+    try:
+        result = func(*args, **kwargs)
+        conn.send(("result", result))
+    except Exception as e:
+        try:
+            conn.send(("error", e))
+        except Exception:
+            # Exception is not picklable, send a plain copy instead
+            conn.send(("error", RuntimeError(f"{type(e).__name__}: {e}")))
+    finally:
+        conn.close()
+
+
+def _preload_modules(modules: List[str]) -> None:
+    """Import modules in the current worker, a no-op where they were preloaded."""
+    for module in modules:
+        importlib.import_module(module)
+
+
+def _thread_entrypoint(send: Callable, func: Callable, args: tuple, kwargs: dict) -> Any:
+    """Run a job on a pool thread, routing its progress events to the pool."""
+    _progress.send = send
+    try:
+        return func(*args, **kwargs)
+    finally:
+        _progress.send = None
+
+
+class WorkerPool:
+    """
+    Runs jobs bounded by a number of slots.
+
+    In "process" mode each job gets its own worker process, which can be
+    killed on cancel or timeout. In "thread" mode jobs share this process
+    and its imports and BLAS thread pools; a cancelled or timed-out job is
+    abandoned but runs to completion, since threads cannot be interrupted.
+
+    With the forkserver start method, preloaded modules are imported once
+    into the fork server and every worker process is forked with them.
+    """
+
+    def __init__(
+        self,
+        max_workers: int,
+        start_method: str,
+        mode: str = "process",
+        preload: Optional[List[str]] = None
+    ):
+        self.max_workers = max_workers
+        self.mode = mode
+        self.preload = preload or []
+
+        if start_method not in multiprocessing.get_all_start_methods():
+            logger.warning(f"Start method {start_method} is not available on this platform, using spawn")
+            start_method = "spawn"
+        self.context = multiprocessing.get_context(start_method)
+        if start_method == "forkserver" and self.preload:
+            self.context.set_forkserver_preload(self.preload)
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._processes: Dict[str, multiprocessing.Process] = {}
+        self._threads: Optional[ThreadPoolExecutor] = None
+        self._thread_jobs: Set[str] = set()
+
+    @property
+    def slots(self) -> asyncio.Semaphore:
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_workers)
+        return self._slots
+
+    @property
+    def active_jobs(self) -> int:
+        """Number of jobs currently running in a worker."""
+        return len(self._processes) + len(self._thread_jobs)
+
+    async def run(
+        self,
+        func: Callable,
+        *args,
+        job_id: Optional[str] = None,
+        on_event: Optional[Callable[[Dict[str, Any]], None]] = None,
+        timeout: Optional[float] = None,
+        **kwargs
+    ) -> Any:
+        """
+        Run func(*args, **kwargs) in a worker process and await its result.
+
+        Progress events sent with report_progress() are passed to on_event
+        on the event loop thread. The worker is killed if the awaiting task
+        is cancelled or the job runs longer than timeout seconds.
+        """
+        job_id = job_id or uuid.uuid4().hex
+        loop = asyncio.get_running_loop()
+
+        def dispatch(event: Dict[str, Any]) -> None:
+            if on_event is not None:
+                loop.call_soon_threadsafe(on_event, event)
+
+        if self.mode == "thread":
+            return await self._run_in_thread(func, args, kwargs, job_id, dispatch, timeout)
+
+        async with self.slots:
+            parent_conn, child_conn = self.context.Pipe(duplex=False)
+            process = self.context.Process(
+                target=_worker_entrypoint,
+                args=(child_conn, func, args, kwargs),
+                name=f"worker-{job_id}"
+            )
+            process.start()
+            # Only the child keeps the sending end, so EOF means the worker died
+            child_conn.close()
+            self._processes[job_id] = process
+            logger.info(f"Started worker process {process.pid} for job {job_id}")
+
+            try:
+                kind, payload = await asyncio.wait_for(
+                    asyncio.to_thread(self._receive, parent_conn, process, dispatch),
+                    timeout=timeout
+                )
+            except asyncio.TimeoutError:
+                logger.warning(f"Job {job_id} exceeded {timeout}s, killing worker {process.pid}")
+                _kill_process_tree(process)
+                raise TimeoutError(f"Job exceeded the time limit of {timeout:.0f} seconds")
+            except asyncio.CancelledError:
+                logger.info(f"Job {job_id} cancelled, killing worker {process.pid}")
+                _kill_process_tree(process)
+                raise
+            finally:
+                self._processes.pop(job_id, None)
+                await asyncio.to_thread(process.join)
+                parent_conn.close()
+
+        if kind == "error":
+            raise payload
+        return payload
+
+    async def _run_in_thread(
+        self,
+        func: Callable,
+        args: tuple,
+        kwargs: dict,
+        job_id: str,
+        dispatch: Callable,
+        timeout: Optional[float]
+    ) -> Any:
+        """Run a job on a pool thread and await its result."""
+        if self._threads is None:
+            self._threads = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="worker")
+        loop = asyncio.get_running_loop()
+
+        async with self.slots:
+            self._thread_jobs.add(job_id)
+            logger.info(f"Started worker thread for job {job_id}")
+            try:
+                return await asyncio.wait_for(
+                    loop.run_in_executor(self._threads, _thread_entrypoint, dispatch, func, args, kwargs),
+                    timeout=timeout
+                )
+            except asyncio.TimeoutError:
+                logger.warning(f"Job {job_id} exceeded {timeout}s, abandoning its worker thread")
+                raise TimeoutError(f"Job exceeded the time limit of {timeout:.0f} seconds")
+            finally:
+                self._thread_jobs.discard(job_id)
+
+    @staticmethod
+    def _receive(conn, process: multiprocessing.Process, dispatch: Callable) -> tuple:
+        """Block until the worker sends its outcome or exits, forwarding progress events."""
+        try:
+            while True:
+                kind, payload = conn.recv()
+                if kind != "event":
+                    return kind, payload
+                dispatch(payload)
+        except EOFError:
+            process.join()
+            raise RuntimeError(f"Worker process exited unexpectedly (exit code {process.exitcode})")
+
+    async def warm_up(self) -> None:
+        """
+        Load the preloaded modules before the first job arrives.
+
+        In process mode this starts the fork server with its preloads through
+        a no-op job; in thread mode the modules are imported into this process.
+        """
+        if not self.preload:
+            return
+
+        start = time.time()
+        # Workers inherit the preload list, so fork servers started inside them
+        # (plot and candidate pools) import the preloaded modules again; without
+        # this flag they skip the warm-up fit
+        os.environ[WARMUP_FIT_ENV] = "1"
+        try:
+            if self.mode == "thread":
+                await asyncio.to_thread(_preload_modules, self.preload)
+            else:
+                await self.run(_preload_modules, self.preload, job_id="warm-up")
+        except Exception as e:
+            logger.warning(f"Worker warm-up failed: {e}")
+            return
+        finally:
+            os.environ.pop(WARMUP_FIT_ENV, None)
+        logger.info(f"Workers warmed up in {time.time() - start:.1f}s")
+
+    def is_running(self, job_id: str) -> bool:
+        """Check whether a job currently occupies a worker."""
+        return job_id in self._processes or job_id in self._thread_jobs
+
+    def shutdown(self) -> None:
+        """Terminate all running worker processes."""
+        for job_id, process in list(self._processes.items()):
+            if process.is_alive():
+                logger.info(f"Terminating worker process {process.pid} for job {job_id}")
+                _kill_process_tree(process)
+        self._processes.clear()
+        if self._threads is not None:
+            self._threads.shutdown(wait=False, cancel_futures=True)
+            self._threads = None
+        self._thread_jobs.clear()
+
+
+# Global training worker pool
+training_pool = WorkerPool(
+    settings.TRAINING_MAX_WORKERS,
+    settings.TRAINING_START_METHOD,
+    settings.TRAINING_EXECUTOR,
+    PRELOAD_MODULES if settings.WORKER_PRELOAD else None
+)
+
+# EDA report worker pool, so reports never wait behind long training jobs;
+# its workers are forked from the same preloaded fork server
+eda_pool = WorkerPool(
+    settings.EDA_MAX_WORKERS,
+    settings.TRAINING_START_METHOD,
+    settings.TRAINING_EXECUTOR,
+    PRELOAD_MODULES if settings.WORKER_PRELOAD else None
+)
+
+# Lazy plot rendering worker pool, so plot requests never wait behind training jobs
+plot_pool = WorkerPool(
+    settings.PLOT_RENDER_MAX_WORKERS,
+    settings.TRAINING_START_METHOD,
+    settings.TRAINING_EXECUTOR,
+    PRELOAD_MODULES if settings.WORKER_PRELOAD else None
+)
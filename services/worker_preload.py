@@ -0,0 +1,83 @@
+"""
+Heavy imports and a warm-up fit for worker processes, run once before jobs arrive.
+
+This module is imported for its side effects. With the forkserver start
+method the worker pool preloads it into the fork server, so every training,
+plot and EDA worker is forked with PyCaret, scikit-learn, LightGBM,
+XGBoost, matplotlib and the report generator already imported and
+initialised. In thread mode it is imported into the API process at startup.
+
+The warm-up fit only runs where WorkerPool.warm_up() asked for it, so a
+fork server started anywhere else (e.g. by a standalone script using the
+forkserver start method) imports this module but skips the fit.
+"""
+
+import logging
+import os
+import time
+
+import matplotlib
+
+# Plots are only ever written to files, never shown
+matplotlib.use("Agg")
+
+import numpy as np
+import pandas as pd
+import lightgbm  # noqa: F401
+import xgboost  # noqa: F401
+from pandas_profiling import ProfileReport  # noqa: F401
+from pycaret.classification import ClassificationExperiment
+from pycaret.regression import RegressionExperiment
+
+from config import settings
+import services.eda_service  # noqa: F401
+import services.plot_service  # noqa: F401
+import services.train_service  # noqa: F401
+from services.worker_pool import WARMUP_FIT_ENV
+
+logger = logging.getLogger(__name__)
+
+
+def warm_up() -> float:
+    """
+    Run PyCaret setup and a small fit for both problem types on a tiny dataset,
+    loading the modules PyCaret only imports on first use. Returns the seconds taken.
+
+    Only models without OpenMP thread pools are fitted: a pool started in the
+    fork server would not survive into the forked workers.
+    """
+    start = time.time()
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        "x1": rng.normal(size=60),
+        "x2": rng.normal(size=60),
+        "x3": rng.choice(["a", "b", "c"], size=60)
+    })
+    df["label"] = (df["x1"] > 0).astype(int)
+    df["value"] = df["x1"] * 2 + rng.normal(size=60)
+
+    for experiment, target, dropped in [
+        (ClassificationExperiment(), "label", "value"),
+        (RegressionExperiment(), "value", "label")
+    ]:
+        experiment.setup(
+            df.drop(columns=dropped),
+            target=target,
+            session_id=123,
+            fold=2,
+            n_jobs=1,
+            html=False,
+            verbose=False
+        )
+        experiment.create_model("lr", verbose=False)
+
+    return time.time() - start
+
+
+# Cleared once used, so processes forked from here do not inherit it
+if os.environ.pop(WARMUP_FIT_ENV, None) and settings.WORKER_WARMUP_FIT:
+    try:
+        logger.info(f"Worker warm-up fit finished in {warm_up():.1f}s")
+    except Exception as e:
+        # Warm-up only saves time, jobs still run without it
+        logger.warning(f"Worker warm-up fit failed: {e}")
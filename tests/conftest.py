@@ -0,0 +1,26 @@
+"""
+Shared test setup.
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Settings are read on import and require a database, which the tests never connect to
+os.environ.setdefault("MONGODB_URL", "mongodb://localhost:27017")
+os.environ.setdefault("MONGODB_DB_NAME", "automl_test")
+
+
+@pytest.fixture
+def dataset() -> pd.DataFrame:
+    """Small binary classification dataset with numeric and categorical features."""
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        "x1": rng.normal(size=120),
+        "x2": rng.normal(size=120),
+        "x3": rng.choice(["a", "b", "c"], size=120)
+    })
+    df["label"] = (df["x1"] + rng.normal(scale=0.5, size=120) > 0).astype(int)
+    return df
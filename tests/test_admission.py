@@ -0,0 +1,98 @@
+"""
+Tests for memory-aware admission of training and EDA jobs.
+"""
+
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from services.admission import AdmissionController, MB
+
+
+def test_jobs_within_budget_are_admitted_right_away():
+    async def scenario():
+        controller = AdmissionController(memory_budget_mb=100, per_user_jobs=2, queue_size=2)
+
+        assert controller.enqueue("a", "u1", "train", 40 * MB) is None
+        assert controller.enqueue("b", "u2", "train", 40 * MB) is None
+        await asyncio.wait_for(controller.wait("a"), 1)
+        assert controller.stats()["running_jobs"] == 2
+
+    asyncio.run(scenario())
+
+
+def test_queue_positions_follow_arrival_order():
+    async def scenario():
+        controller = AdmissionController(memory_budget_mb=100, per_user_jobs=5, queue_size=5)
+        controller.enqueue("running", "u1", "train", 80 * MB)
+
+        assert controller.enqueue("first", "u2", "train", 50 * MB) == 1
+        # Fits in the free memory, but waits behind the larger job
+        assert controller.enqueue("second", "u3", "eda", 10 * MB) == 2
+
+        controller.release("first")
+        assert controller.position("second") is None
+        assert controller.stats()["queued_jobs"] == 0
+
+    asyncio.run(scenario())
+
+
+def test_full_queue_rejects_with_429_only_when_full():
+    async def scenario():
+        controller = AdmissionController(memory_budget_mb=100, per_user_jobs=5, queue_size=1)
+        controller.enqueue("running", "u1", "train", 100 * MB)
+        assert controller.enqueue("queued", "u2", "train", 10 * MB) == 1
+
+        with pytest.raises(HTTPException) as error:
+            controller.enqueue("rejected", "u3", "train", 10 * MB)
+
+        assert error.value.status_code == 429
+        assert controller.position("rejected") is None
+        assert controller.position("queued") == 1
+
+    asyncio.run(scenario())
+
+
+def test_user_cap_lets_other_users_pass():
+    async def scenario():
+        controller = AdmissionController(memory_budget_mb=100, per_user_jobs=1, queue_size=5)
+        controller.enqueue("u1-first", "u1", "train", 10 * MB)
+
+        assert controller.enqueue("u1-second", "u1", "train", 10 * MB) == 1
+        assert controller.enqueue("u2-first", "u2", "train", 10 * MB) is None
+
+        controller.release("u1-first")
+        await asyncio.wait_for(controller.wait("u1-second"), 1)
+
+    asyncio.run(scenario())
+
+
+def test_job_larger_than_budget_runs_alone():
+    async def scenario():
+        controller = AdmissionController(memory_budget_mb=100, per_user_jobs=5, queue_size=5)
+
+        assert controller.enqueue("huge", "u1", "train", 500 * MB) is None
+        assert controller.enqueue("small", "u2", "train", 1 * MB) == 1
+
+        controller.release("huge")
+        assert controller.position("small") is None
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_wait_leaves_the_queue():
+    async def scenario():
+        controller = AdmissionController(memory_budget_mb=100, per_user_jobs=5, queue_size=5)
+        controller.enqueue("running", "u1", "train", 100 * MB)
+        controller.enqueue("waiting", "u2", "train", 10 * MB)
+
+        waiter = asyncio.ensure_future(controller.wait("waiting"))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+        assert controller.position("waiting") is None
+
+    asyncio.run(scenario())
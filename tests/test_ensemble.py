@@ -0,0 +1,102 @@
+"""
+Tests for blending and stacking candidate models from out-of-fold predictions.
+"""
+
+import numpy as np
+import pytest
+
+pytest.importorskip("sklearn")
+
+from sklearn.model_selection import KFold, StratifiedKFold
+
+from utils.ensemble import EnsembleBuilder, EnsembleModel
+
+
+class ConstantModel:
+    """Stand-in finalized pipeline returning fixed predictions for every row."""
+
+    def __init__(self, values):
+        self.values = np.asarray(values, dtype=float)
+
+    def predict_proba(self, X):
+        return np.tile(self.values, (len(X), 1))
+
+    def predict(self, X):
+        return np.full(len(X), self.values[0])
+
+
+def test_blend_averages_member_probabilities():
+    features = np.column_stack([
+        np.array([[0.8, 0.2], [0.4, 0.6]]),
+        np.array([[0.6, 0.4], [0.0, 1.0]])
+    ])
+
+    combined = EnsembleBuilder.combine(features, 2, "classification", "blend")
+
+    np.testing.assert_allclose(combined, [[0.7, 0.3], [0.2, 0.8]])
+
+
+def test_select_scores_blend_and_stack_on_classification(dataset):
+    y_true = dataset["label"].to_numpy()
+    rng = np.random.default_rng(0)
+    # One informative member and one that is pure noise
+    informative = np.column_stack([1 - y_true, y_true]) * 0.6 + 0.2
+    noise = rng.dirichlet([1, 1], size=len(y_true))
+
+    method, cv_score, meta_model = EnsembleBuilder.select(
+        [informative, noise], y_true, "classification", StratifiedKFold(3, shuffle=True, random_state=0)
+    )
+
+    assert method in ("blend", "stack")
+    assert 0.0 <= cv_score <= 1.0
+    assert (meta_model is None) == (method == "blend")
+    assert cv_score >= EnsembleBuilder.score(y_true, noise, "classification")
+
+
+def test_stack_is_chosen_when_a_member_is_inverted(dataset):
+    y_true = dataset["x1"].to_numpy()
+    # Averaging cancels the members out, a linear meta-model recovers the target
+    members = [y_true + 1.0, -y_true]
+
+    method, cv_score, meta_model = EnsembleBuilder.select(
+        members, y_true, "regression", KFold(3, shuffle=True, random_state=0)
+    )
+
+    assert method == "stack"
+    assert cv_score < EnsembleBuilder.score(y_true, members[0], "regression")
+    assert meta_model is not None
+
+
+def test_ensemble_model_predicts_original_labels():
+    model = EnsembleModel(
+        {"a": ConstantModel([0.9, 0.1]), "b": ConstantModel([0.3, 0.7])},
+        "classification",
+        "blend",
+        classes=np.array(["no", "yes"])
+    )
+    X = np.zeros((3, 2))
+
+    np.testing.assert_allclose(model.predict_proba(X), [[0.6, 0.4]] * 3)
+    assert list(model.predict(X)) == ["no", "no", "no"]
+
+
+def test_regression_ensemble_has_no_probabilities():
+    model = EnsembleModel({"a": ConstantModel([1.0]), "b": ConstantModel([3.0])}, "regression", "blend")
+
+    np.testing.assert_allclose(model.predict(np.zeros((2, 1))), [2.0, 2.0])
+    with pytest.raises(AttributeError):
+        model.predict_proba(np.zeros((2, 1)))
+
+
+def test_oof_predictions_cover_every_training_row(dataset):
+    pytest.importorskip("pycaret")
+    from pycaret.classification import ClassificationExperiment
+
+    experiment = ClassificationExperiment()
+    experiment.setup(dataset, target="label", session_id=123, fold=3, n_jobs=1, verbose=False)
+    model = experiment.create_model("lr", verbose=False)
+
+    predictions = EnsembleBuilder.oof_predictions(experiment, model, "classification")
+
+    assert predictions.shape == (len(experiment.get_config("X_train")), 2)
+    np.testing.assert_allclose(predictions.sum(axis=1), 1.0)
@@ -0,0 +1,45 @@
+"""
+Tests for the disk-backed cache of prepared PyCaret experiments.
+"""
+
+import pandas as pd
+import pytest
+
+pytest.importorskip("pycaret")
+
+from pycaret.classification import ClassificationExperiment
+
+from services.experiment_cache import ExperimentCache
+
+
+@pytest.fixture
+def cache(tmp_path) -> ExperimentCache:
+    return ExperimentCache(tmp_path, 100 * 1024 * 1024)
+
+
+def test_cached_experiment_keeps_its_dataset(cache, dataset):
+    experiment = ClassificationExperiment()
+    experiment.setup(dataset, target="label", session_id=123, fold=3, n_jobs=1, verbose=False)
+    cache.put_experiment("setup_test", experiment)
+
+    restored = cache.get_experiment("setup_test")
+
+    assert restored is not None
+    pd.testing.assert_frame_equal(restored.dataset, experiment.dataset)
+    pd.testing.assert_frame_equal(restored.X_train, experiment.X_train)
+
+    model = restored.compare_models(include=["lr"], n_select=1, verbose=False)
+    if isinstance(model, list):
+        model = model[0] if model else None
+    assert model is not None
+    assert len(restored.pull()) == 1
+
+    final_model = restored.finalize_model(model)
+    assert len(final_model.predict(dataset.drop(columns="label"))) == len(dataset)
+
+
+def test_entry_without_experiment_is_a_miss(cache):
+    cache.put("setup_plain", {"not": "an experiment"})
+
+    assert cache.get_experiment("setup_plain") is None
+    assert cache.get_experiment("setup_missing") is None
@@ -0,0 +1,121 @@
+"""
+Tests for the registry of background training jobs and its event stream.
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from services.job_tracker import JobTracker
+
+
+async def collect(events):
+    return [event async for event in events]
+
+
+def test_subscriber_gets_past_and_live_events_until_the_job_ends():
+    async def scenario():
+        tracker = JobTracker()
+        release = asyncio.Event()
+
+        async def job():
+            await release.wait()
+            return "done"
+
+        tracker.start("job", job())
+        tracker.publish("job", {"stage": "csv_parsed", "progress": 0.05})
+
+        subscription = asyncio.ensure_future(collect(tracker.subscribe("job")))
+        await asyncio.sleep(0)
+        tracker.publish("job", {"stage": "model_saved", "progress": 0.9})
+        tracker.publish("job", {"stage": "completed", "progress": 1.0})
+        # Events after the terminal one are not delivered
+        tracker.publish("job", {"stage": "late", "progress": 1.0})
+
+        events = await asyncio.wait_for(subscription, 1)
+        assert [event["stage"] for event in events] == ["csv_parsed", "model_saved", "completed"]
+
+        release.set()
+        assert await tracker.wait("job") == "done"
+        await asyncio.sleep(0)
+        assert tracker.events("job") == []
+
+    asyncio.run(scenario())
+
+
+def test_subscription_to_a_finished_job_ends_right_away():
+    async def scenario():
+        tracker = JobTracker()
+
+        assert await asyncio.wait_for(collect(tracker.subscribe("gone")), 1) == []
+
+    asyncio.run(scenario())
+
+
+def test_inflight_job_is_claimed_once_and_released_when_done():
+    async def scenario():
+        tracker = JobTracker()
+        first = {"job_id": "first"}
+
+        assert tracker.claim("fingerprint", first) is first
+        assert tracker.claim("fingerprint", {"job_id": "second"}) is first
+
+        task = tracker.start("first", asyncio.sleep(0))
+        await task
+        await asyncio.sleep(0)
+
+        assert tracker.find_inflight("fingerprint") is None
+        assert tracker.get("first") is None
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_job_is_reported_to_waiters():
+    async def scenario():
+        tracker = JobTracker()
+        tracker.start("job", asyncio.sleep(60))
+        waiter = asyncio.ensure_future(tracker.wait("job"))
+        await asyncio.sleep(0)
+
+        assert await tracker.cancel("job", timeout=1)
+        with pytest.raises(RuntimeError):
+            await waiter
+        assert not await tracker.cancel("job")
+
+    asyncio.run(scenario())
+
+
+def test_events_are_formatted_as_sse():
+    pytest.importorskip("pycaret")
+    from routes.train import _format_sse
+
+    async def events():
+        yield {"stage": "csv_parsed", "progress": 0.05}
+        yield {"stage": "completed", "progress": 1.0}
+
+    async def scenario():
+        return await collect(_format_sse(events()))
+
+    messages = asyncio.run(scenario())
+
+    assert messages[0].startswith("event: csv_parsed\ndata: ")
+    assert messages[0].endswith("\n\n")
+    assert json.loads(messages[1].split("data: ", 1)[1]) == {"stage": "completed", "progress": 1.0}
+
+
+def test_sse_stream_sends_keepalives_while_waiting():
+    pytest.importorskip("pycaret")
+    from routes.train import _format_sse
+
+    async def events():
+        await asyncio.sleep(0.05)
+        yield {"stage": "completed", "progress": 1.0}
+
+    async def scenario():
+        return await collect(_format_sse(events(), keepalive=0.01))
+
+    messages = asyncio.run(scenario())
+
+    assert messages[0] == ": keep-alive\n\n"
+    assert messages[-1].startswith("event: completed")
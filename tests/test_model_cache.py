@@ -0,0 +1,110 @@
+"""
+Tests for the in-memory LRU cache of loaded models.
+"""
+
+import os
+import pickle
+
+import pytest
+
+from services.model_cache import ModelCache
+
+
+def save_model(directory, name: str, model, padding: int = 0):
+    """Pickle a stand-in model, padded to control its size on disk."""
+    filepath = directory / name
+    with open(filepath, 'wb') as f:
+        pickle.dump({"model": model, "padding": b"x" * padding}, f)
+    return filepath
+
+
+@pytest.fixture
+def models(tmp_path):
+    return [save_model(tmp_path, f"model_{index}.pkl", index, padding=1000) for index in range(3)]
+
+
+def test_repeated_gets_hit_the_cache(models):
+    cache = ModelCache(max_bytes=10_000)
+
+    first = cache.get(models[0])
+    second = cache.get(models[0])
+
+    assert first is second
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_least_recently_used_model_is_evicted(models):
+    size = models[0].stat().st_size
+    cache = ModelCache(max_bytes=2 * size)
+
+    cache.get(models[0])
+    cache.get(models[1])
+    cache.get(models[0])
+    cache.get(models[2])
+
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["entries"] == 2
+    cache.get(models[0])
+    assert cache.stats()["hits"] == 2
+    cache.get(models[1])
+    assert cache.stats()["misses"] == 4
+
+
+def test_model_larger_than_budget_is_not_cached(models):
+    cache = ModelCache(max_bytes=10)
+
+    cache.get(models[0])
+
+    assert cache.stats()["entries"] == 0
+
+
+def test_replaced_file_is_reloaded(tmp_path, models):
+    cache = ModelCache(max_bytes=10_000)
+    cache.get(models[0])
+
+    save_model(tmp_path, models[0].name, "replaced")
+    stat = models[0].stat()
+    os.utime(models[0], ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    assert cache.get(models[0])["model"] == "replaced"
+
+
+def test_invalidate_drops_the_model_and_its_metadata(models):
+    cache = ModelCache(max_bytes=10_000)
+    cache.get(models[0])
+    cache.put_metadata(models[0].name, {"expected_input": None})
+
+    assert cache.get_metadata(models[0].name) == {"expected_input": None}
+    assert cache.invalidate(models[0].name)
+    assert cache.get_metadata(models[0].name) is None
+    assert not cache.invalidate(models[0].name)
+    assert cache.stats()["invalidations"] == 1
+
+
+def test_metadata_is_not_kept_without_the_model(models):
+    cache = ModelCache(max_bytes=10_000)
+
+    cache.put_metadata(models[0].name, {"expected_input": None})
+
+    assert cache.get_metadata(models[0].name) is None
+
+
+def test_deleted_file_is_invalidated(models):
+    cache = ModelCache(max_bytes=10_000)
+    cache.get(models[0])
+    models[0].unlink()
+
+    with pytest.raises(FileNotFoundError):
+        cache.get(models[0])
+    assert cache.stats()["entries"] == 0
+
+
+def test_disabled_cache_always_loads(models):
+    cache = ModelCache(max_bytes=10_000, enabled=False)
+
+    cache.get(models[0])
+    cache.get(models[0])
+
+    assert cache.stats()["misses"] == 2
+    assert cache.stats()["entries"] == 0
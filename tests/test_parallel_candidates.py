@@ -0,0 +1,31 @@
+"""
+Tests for evaluating candidate models in parallel worker processes.
+"""
+
+import pytest
+
+pytest.importorskip("pycaret")
+
+from services.experiment_cache import ExperimentCache, experiment_cache
+from services.train_service import TrainService, evaluate_candidate_in_worker
+
+
+@pytest.fixture
+def experiment(monkeypatch, dataset):
+    monkeypatch.setattr(experiment_cache, "enabled", False)
+    return TrainService()._setup_pycaret(dataset, "label", "classification")
+
+
+def test_worker_evaluates_candidate_on_serialized_experiment(experiment):
+    model, row = evaluate_candidate_in_worker(ExperimentCache.dumps_experiment(experiment), "lr", "Accuracy")
+
+    assert model is not None
+    assert 0.0 <= float(row.iloc[0]["Accuracy"]) <= 1.0
+
+
+def test_parallel_candidates_all_finish(experiment):
+    results = list(TrainService()._iter_candidates_parallel(experiment, ["lr", "dt"], "Accuracy", None))
+
+    assert sorted(model_id for model_id, _, _, _ in results) == ["dt", "lr"]
+    assert all(status == "finished" for _, status, _, _ in results)
+    assert all(model is not None for _, _, model, _ in results)
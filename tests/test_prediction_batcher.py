@@ -0,0 +1,140 @@
+"""
+Tests for micro-batching of concurrent predictions.
+"""
+
+import asyncio
+
+import pandas as pd
+import pytest
+
+from services.prediction_batcher import PredictionBatcher
+
+
+class RecordingModel:
+    """Predicts x1 doubled and fails on negative x1, recording the size of every call."""
+
+    def __init__(self):
+        self.calls = []
+
+    def score(self, input_df: pd.DataFrame):
+        self.calls.append(len(input_df))
+        if (input_df["x1"] < 0).any():
+            raise ValueError("negative x1")
+        return (input_df["x1"] * 2).tolist(), None
+
+
+def score(model, input_df: pd.DataFrame):
+    return model.score(input_df)
+
+
+def row(x1, **columns) -> pd.DataFrame:
+    return pd.DataFrame([{"x1": x1, **columns}])
+
+
+def test_concurrent_requests_share_one_call_after_the_window():
+    async def scenario():
+        batcher = PredictionBatcher(window_ms=20, max_batch_rows=100)
+        model = RecordingModel()
+
+        results = await asyncio.gather(*[
+            batcher.submit("model.pkl", model, row(float(x1)), score) for x1 in range(5)
+        ])
+
+        assert model.calls == [5]
+        assert [predictions for predictions, _ in results] == [[0.0], [2.0], [4.0], [6.0], [8.0]]
+        assert batcher.stats()["batches"] == 1
+
+    asyncio.run(scenario())
+
+
+def test_full_batch_is_scored_before_the_window_ends():
+    async def scenario():
+        batcher = PredictionBatcher(window_ms=10_000, max_batch_rows=3)
+        model = RecordingModel()
+
+        results = await asyncio.wait_for(asyncio.gather(*[
+            batcher.submit("model.pkl", model, row(float(x1)), score) for x1 in range(3)
+        ]), 5)
+
+        assert model.calls == [3]
+        assert len(results) == 3
+
+    asyncio.run(scenario())
+
+
+def test_bad_row_only_fails_its_own_request():
+    async def scenario():
+        batcher = PredictionBatcher(window_ms=20, max_batch_rows=100)
+        model = RecordingModel()
+
+        results = await asyncio.gather(
+            batcher.submit("model.pkl", model, row(1.0), score),
+            batcher.submit("model.pkl", model, row(-1.0), score),
+            batcher.submit("model.pkl", model, row(2.0), score),
+            return_exceptions=True
+        )
+
+        assert results[0] == ([2.0], None)
+        assert isinstance(results[1], ValueError)
+        assert results[2] == ([4.0], None)
+        # The combined call, then every request on its own
+        assert model.calls == [3, 1, 1, 1]
+
+    asyncio.run(scenario())
+
+
+def test_rows_with_different_columns_or_dtypes_are_not_combined():
+    async def scenario():
+        batcher = PredictionBatcher(window_ms=20, max_batch_rows=100)
+        model = RecordingModel()
+
+        await asyncio.gather(
+            batcher.submit("model.pkl", model, row(1.0, x3="a"), score),
+            batcher.submit("model.pkl", model, row(2.0, x3="b"), score),
+            batcher.submit("model.pkl", model, row(3.0), score),
+            batcher.submit("model.pkl", model, row(4, x3="c"), score)
+        )
+
+        assert sorted(model.calls) == [1, 1, 2]
+
+    asyncio.run(scenario())
+
+
+def test_requests_for_other_models_are_not_combined():
+    async def scenario():
+        batcher = PredictionBatcher(window_ms=20, max_batch_rows=100)
+        first, second = RecordingModel(), RecordingModel()
+
+        await asyncio.gather(
+            batcher.submit("first.pkl", first, row(1.0), score),
+            batcher.submit("second.pkl", second, row(2.0), score)
+        )
+
+        assert first.calls == [1]
+        assert second.calls == [1]
+
+    asyncio.run(scenario())
+
+
+def test_disabled_batcher_scores_each_request():
+    async def scenario():
+        batcher = PredictionBatcher(window_ms=20, max_batch_rows=100, enabled=False)
+        model = RecordingModel()
+
+        await asyncio.gather(*[batcher.submit("model.pkl", model, row(1.0), score) for _ in range(3)])
+
+        assert model.calls == [1, 1, 1]
+
+    asyncio.run(scenario())
+
+
+def test_single_failing_request_gets_its_error():
+    async def scenario():
+        batcher = PredictionBatcher(window_ms=1, max_batch_rows=100)
+        model = RecordingModel()
+
+        with pytest.raises(ValueError):
+            await batcher.submit("model.pkl", model, row(-1.0), score)
+        assert model.calls == [1]
+
+    asyncio.run(scenario())
@@ -0,0 +1,91 @@
+"""
+Tests for cell-budgeted, target-stratified dataset sampling.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from config import settings
+from utils.sampling import DatasetSampler
+
+
+@pytest.fixture
+def budget(monkeypatch):
+    """Limit samples of two-column datasets to 100 rows."""
+    monkeypatch.setattr(settings, "MAX_DATASET_CELLS", 200)
+    monkeypatch.setattr(settings, "SAMPLING_MIN_CLASS_ROWS", 5)
+    monkeypatch.setattr(settings, "SAMPLING_MAX_STRATA", 10)
+
+
+def write_csv(tmp_path, df: pd.DataFrame):
+    filepath = tmp_path / "data.csv"
+    df.to_csv(filepath, index=False)
+    return filepath
+
+
+def test_rare_class_survives_sampling(budget, tmp_path):
+    rng = np.random.default_rng(0)
+    labels = np.array(["common"] * 2000 + ["rare"] * 8)
+    rng.shuffle(labels)
+    df = pd.DataFrame({"x": rng.normal(size=len(labels)), "label": labels})
+
+    sample, total_rows = DatasetSampler.sample_csv(write_csv(tmp_path, df), "label", chunksize=300)
+
+    assert total_rows == len(df)
+    counts = sample["label"].value_counts()
+    assert counts["rare"] == 5
+    assert len(sample) == counts["common"] + counts["rare"]
+    assert len(sample) <= 100 + 5
+
+
+def test_rows_without_target_are_dropped(budget, tmp_path):
+    df = pd.DataFrame({"x": range(50), "label": [None, "a"] * 25})
+
+    sample, total_rows = DatasetSampler.sample_csv(write_csv(tmp_path, df), "label", chunksize=20)
+
+    assert total_rows == 25
+    assert sample["label"].notna().all()
+
+
+def test_continuous_target_falls_back_to_uniform_sampling(budget, tmp_path):
+    rng = np.random.default_rng(1)
+    df = pd.DataFrame({"x": np.arange(1000), "y": rng.normal(size=1000)})
+
+    sample, total_rows = DatasetSampler.sample_csv(write_csv(tmp_path, df), "y", chunksize=150)
+
+    assert total_rows == 1000
+    assert len(sample) == 100
+    assert sample["x"].is_unique
+    # Kept in file order and spread over the whole file, not just its first chunk
+    assert sample["x"].is_monotonic_increasing
+    assert sample["x"].max() > 150
+
+
+def test_strata_fallback_once_classes_accumulate_over_chunks(budget, tmp_path):
+    # Every chunk has few values, but together they exceed SAMPLING_MAX_STRATA
+    df = pd.DataFrame({"x": np.arange(600), "label": np.repeat(np.arange(12), 50)})
+
+    sample, total_rows = DatasetSampler.sample_csv(write_csv(tmp_path, df), "label", chunksize=100)
+
+    assert total_rows == 600
+    assert len(sample) == 100
+    assert sample["x"].is_unique
+
+
+def test_small_file_is_kept_whole(budget, tmp_path):
+    df = pd.DataFrame({"x": range(30), "label": [0, 1, 2] * 10})
+
+    sample, total_rows = DatasetSampler.sample_csv(write_csv(tmp_path, df), "label")
+
+    assert total_rows == 30
+    pd.testing.assert_frame_equal(sample, df)
+
+
+def test_sample_frame_keeps_minimum_per_class(dataset):
+    df = pd.concat([dataset, dataset.head(2).assign(label=2)], ignore_index=True)
+
+    sample = DatasetSampler.sample_frame(df, 30, "label", min_class_rows=2)
+
+    assert (sample["label"] == 2).sum() == 2
+    assert set(sample["label"]) == {0, 1, 2}
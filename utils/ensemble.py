@@ -0,0 +1,156 @@
+"""
+Ensemble utilities for blending and stacking trained candidate models.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from sklearn.base import clone
+from sklearn.linear_model import LogisticRegression, Ridge
+from sklearn.metrics import accuracy_score, mean_absolute_error
+from sklearn.model_selection import cross_val_predict
+
+# Candidate id an ensemble is kept and promoted under
+ENSEMBLE_MODEL_ID = "ensemble"
+
+
+class EnsembleModel:
+    """
+    Combines finalized PyCaret pipelines by averaging their predictions
+    (blend) or with a linear meta-model over them (stack).
+
+    Exposes predict and predict_proba like the pipelines it wraps, so it is
+    saved and served like any other model file.
+    """
+
+    def __init__(
+        self,
+        members: Dict[str, Any],
+        problem_type: str,
+        method: str,
+        classes: Optional[np.ndarray] = None,
+        meta_model: Any = None
+    ):
+        self.members = members
+        self.problem_type = problem_type
+        self.method = method
+        self.classes_ = classes
+        self.meta_model = meta_model
+
+    def _member_predictions(self, X) -> np.ndarray:
+        if self.problem_type == "classification":
+            return np.hstack([member.predict_proba(X) for member in self.members.values()])
+        return np.column_stack([member.predict(X) for member in self.members.values()])
+
+    def _combine(self, X) -> np.ndarray:
+        return EnsembleBuilder.combine(
+            self._member_predictions(X), len(self.members), self.problem_type, self.method, self.meta_model
+        )
+
+    def predict_proba(self, X) -> np.ndarray:
+        if self.problem_type != "classification":
+            raise AttributeError("predict_proba is only available for classification ensembles")
+        return self._combine(X)
+
+    def predict(self, X) -> np.ndarray:
+        combined = self._combine(X)
+        if self.problem_type == "classification":
+            return self.classes_[combined.argmax(axis=1)]
+        return combined
+
+
+class EnsembleBuilder:
+    """Out-of-fold scoring and fitting of blended and stacked ensembles."""
+
+    @staticmethod
+    def oof_predictions(experiment, model, problem_type: str) -> np.ndarray:
+        """
+        Get out-of-fold predictions of a candidate on the experiment's CV folds:
+        class probabilities for classification, values for regression.
+
+        The experiment's preprocessing pipeline is cross-validated together
+        with the model, so imputers and encoders are refit inside every fold
+        as in PyCaret's own CV and the held-out fold never leaks into them.
+        """
+        pipeline = clone(experiment.pipeline)
+        pipeline.steps.append(("actual_estimator", clone(model)))
+
+        method = "predict_proba" if problem_type == "classification" else "predict"
+        return cross_val_predict(
+            pipeline,
+            experiment.get_config("X_train"),
+            experiment.get_config("y_train"),
+            cv=experiment.get_config("fold_generator"),
+            method=method
+        )
+
+    @staticmethod
+    def score(y_true: np.ndarray, predictions: np.ndarray, problem_type: str) -> float:
+        """Score pooled out-of-fold predictions with the leaderboard metric (Accuracy or MAE)."""
+        if problem_type == "classification":
+            return float(accuracy_score(y_true, predictions.argmax(axis=1)))
+        return float(mean_absolute_error(y_true, predictions))
+
+    @staticmethod
+    def meta_model(problem_type: str):
+        """Create the unfitted meta-model used for stacking."""
+        if problem_type == "classification":
+            return LogisticRegression(max_iter=1000)
+        return Ridge()
+
+    @staticmethod
+    def combine(
+        features: np.ndarray,
+        n_members: int,
+        problem_type: str,
+        method: str,
+        meta_model: Any = None
+    ) -> np.ndarray:
+        """Combine stacked member predictions into class probabilities or values."""
+        if method == "stack":
+            if problem_type == "classification":
+                return meta_model.predict_proba(features)
+            return meta_model.predict(features)
+
+        if problem_type == "classification":
+            return features.reshape(len(features), n_members, -1).mean(axis=1)
+        return features.mean(axis=1)
+
+    @staticmethod
+    def select(
+        oof: List[np.ndarray],
+        y_true: np.ndarray,
+        problem_type: str,
+        cv
+    ) -> Tuple[str, float, Any]:
+        """
+        Pick blend or stack by out-of-fold score and fit the meta-model if stacking.
+
+        The blend has no fitted parameters, so the score of its averaged
+        out-of-fold predictions is already honest. The meta-model is scored on
+        predictions made for folds it was not fitted on, using the same folds,
+        before being refitted on all out-of-fold predictions.
+
+        Returns the method, its CV score and the fitted meta-model (None for a blend).
+        """
+        features = np.column_stack(oof)
+        lower_is_better = problem_type != "classification"
+
+        scores = {
+            "blend": EnsembleBuilder.score(
+                y_true, EnsembleBuilder.combine(features, len(oof), problem_type, "blend"), problem_type
+            )
+        }
+
+        meta_method = "predict_proba" if problem_type == "classification" else "predict"
+        stacked = cross_val_predict(
+            EnsembleBuilder.meta_model(problem_type), features, y_true, cv=cv, method=meta_method
+        )
+        scores["stack"] = EnsembleBuilder.score(y_true, stacked, problem_type)
+
+        method = min(scores, key=scores.get) if lower_is_better else max(scores, key=scores.get)
+        meta_model = None
+        if method == "stack":
+            meta_model = EnsembleBuilder.meta_model(problem_type).fit(features, y_true)
+
+        return method, scores[method], meta_model
@@ -3,6 +3,8 @@ File operation utilities for AutoML platform.
 """
 
 import os
+import asyncio
+import hashlib
 import aiofiles
 import shutil
 from pathlib import Path
@@ -13,6 +15,7 @@ import pandas as pd
 from fastapi import UploadFile, HTTPException
 
 from config import settings
+from utils.sampling import DatasetSampler
 
 logger = logging.getLogger(__name__)
 
@@ -27,10 +30,12 @@ class FileManager:
             # Ensure directory exists
             filepath.parent.mkdir(parents=True, exist_ok=True)
             
-            # Save file
+            # Save file in chunks, so large uploads are never held in memory at once
+            digest = hashlib.sha256()
             async with aiofiles.open(filepath, 'wb') as f:
-                content = await file.read()
-                await f.write(content)
+                while chunk := await file.read(1024 * 1024):
+                    digest.update(chunk)
+                    await f.write(chunk)
             
             # Get file stats
             stat = filepath.stat()
@@ -39,6 +44,7 @@ class FileManager:
                 "filename": filepath.name,
                 "filepath": str(filepath),
                 "size": stat.st_size,
+                "sha256": digest.hexdigest(),
                 "created_at": datetime.fromtimestamp(stat.st_ctime)
             }
             
@@ -47,8 +53,8 @@ class FileManager:
             raise HTTPException(status_code=500, detail=f"Failed to save file: {str(e)}")
     
     @staticmethod
-    async def read_csv_file(filepath: Path, max_rows: Optional[int] = None) -> pd.DataFrame:
-        """Read CSV file with validation and size limits."""
+    async def read_csv_file(filepath: Path, target_column: Optional[str] = None) -> pd.DataFrame:
+        """Read CSV file with validation, sampled down to the cell budget (stratified on target_column if given)."""
         try:
             # Check file exists
             if not filepath.exists():
@@ -62,19 +68,12 @@ class FileManager:
                     detail=f"File too large. Max size: {settings.MAX_FILE_SIZE_MB}MB"
                 )
             
-            # Read CSV with limits
-            df = pd.read_csv(
-                filepath,
-                nrows=max_rows or settings.MAX_DATASET_ROWS
-            )
+            # Sample the whole file down to the cell budget in a single pass
+            df, total_rows = await asyncio.to_thread(DatasetSampler.sample_csv, filepath, target_column)
+            if total_rows > len(df):
+                logger.info(f"Sampled {len(df)} of {total_rows} rows from {filepath.name}")
             
             # Validate dataset dimensions
-            if len(df) > settings.MAX_DATASET_ROWS:
-                raise HTTPException(
-                    status_code=413,
-                    detail=f"Dataset has too many rows. Max: {settings.MAX_DATASET_ROWS}"
-                )
-            
             if len(df.columns) > settings.MAX_DATASET_COLUMNS:
                 raise HTTPException(
                     status_code=413,
@@ -46,6 +46,18 @@ class NamingUtils:
         
         return f"{user_id}_{sanitized_dataset}_{timestamp}_{unique_id}.pkl"
     
+    @staticmethod
+    def generate_candidate_filename(model_filename: str, model_id: str) -> str:
+        """Generate filename for a runner-up model kept alongside a trained model."""
+        sanitized_model_id = NamingUtils.sanitize_filename(model_id)
+        
+        return f"{Path(model_filename).stem}_candidate_{sanitized_model_id}.pkl"
+    
+    @staticmethod
+    def generate_snapshot_filename(model_filename: str) -> str:
+        """Generate filename for the plot snapshot stored with a trained model."""
+        return f"{Path(model_filename).stem}_snapshot.pkl"
+    
     @staticmethod
     def generate_plot_filename(user_id: str, model_name: str, plot_type: str) -> str:
         """Generate unique filename for evaluation plots."""
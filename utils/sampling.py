@@ -0,0 +1,132 @@
+"""
+Dataset sampling utilities for keeping datasets within the cell budget.
+"""
+
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from config import settings
+
+# Random priority column used while sampling
+SAMPLE_KEY = "__sample_key__"
+
+
+class DatasetSampler:
+    """Cell-budgeted, target-stratified sampling of datasets."""
+
+    @staticmethod
+    def row_budget(n_columns: int) -> int:
+        """Get the number of rows that fit in the cell budget for a dataset width."""
+        return max(1, settings.MAX_DATASET_CELLS // max(n_columns, 1))
+
+    @staticmethod
+    def class_quotas(class_counts: Dict[Any, int], n_rows: int, min_class_rows: int) -> Dict[Any, int]:
+        """Split a row budget over classes proportionally, keeping a minimum for rare classes."""
+        total = sum(class_counts.values())
+        if total <= n_rows:
+            return dict(class_counts)
+
+        fraction = n_rows / total
+        return {
+            value: min(count, max(round(count * fraction), min_class_rows))
+            for value, count in class_counts.items()
+        }
+
+    @staticmethod
+    def sample_frame(
+        df: pd.DataFrame,
+        n_rows: int,
+        target_column: Optional[str] = None,
+        min_class_rows: int = 1
+    ) -> pd.DataFrame:
+        """Sample rows of a loaded dataset, stratified on the target column if given."""
+        if n_rows >= len(df):
+            return df
+        if target_column is None:
+            return df.sample(n=n_rows, random_state=42)
+
+        quotas = DatasetSampler.class_quotas(
+            df[target_column].value_counts().to_dict(), n_rows, min_class_rows
+        )
+        parts = [
+            group.sample(n=quotas[value], random_state=42)
+            for value, group in df.groupby(target_column, sort=False)
+        ]
+        return pd.concat(parts)
+
+    @staticmethod
+    def sample_csv(
+        filepath: Path,
+        target_column: Optional[str] = None,
+        chunksize: int = 10000
+    ) -> Tuple[pd.DataFrame, int]:
+        """
+        Sample a CSV file down to the cell budget in a single pass.
+
+        Every row gets a random priority and a reservoir keeps the rows with
+        the smallest ones, which is a uniform sample without replacement over
+        the whole file rather than its first lines. With a target column, rows
+        without a target are dropped and one reservoir is kept per target value
+        so rare classes survive; targets with more than SAMPLING_MAX_STRATA
+        values are sampled uniformly instead.
+
+        Returns the sample in file order and the number of rows read.
+        """
+        rng = np.random.default_rng(42)
+        reservoirs: Dict[Any, pd.DataFrame] = {}
+        class_counts: Dict[Any, int] = {}
+        stratify = target_column is not None
+        columns = None
+        n_rows = 0
+        total_rows = 0
+
+        for chunk in pd.read_csv(filepath, chunksize=chunksize):
+            if columns is None:
+                columns = chunk.columns
+                n_rows = DatasetSampler.row_budget(len(columns))
+                stratify = stratify and target_column in columns
+
+            if stratify:
+                chunk = chunk.dropna(subset=[target_column])
+            chunk = chunk.assign(**{SAMPLE_KEY: rng.random(len(chunk))})
+            total_rows += len(chunk)
+
+            # Too many target values to stratify on, e.g. a continuous target;
+            # checked before grouping since grouping on them is what is slow
+            if stratify and len(set(reservoirs).union(chunk[target_column].unique())) > settings.SAMPLING_MAX_STRATA:
+                stratify = False
+                chunk = pd.concat([*reservoirs.values(), chunk])
+                reservoirs = {}
+
+            if not stratify:
+                reservoirs[None] = DatasetSampler._keep_smallest(reservoirs.get(None), chunk, n_rows)
+                continue
+
+            for value, group in chunk.groupby(target_column, sort=False):
+                class_counts[value] = class_counts.get(value, 0) + len(group)
+                reservoirs[value] = DatasetSampler._keep_smallest(reservoirs.get(value), group, n_rows)
+
+        if not reservoirs:
+            return pd.read_csv(filepath, nrows=0), 0
+
+        if stratify:
+            quotas = DatasetSampler.class_quotas(class_counts, n_rows, settings.SAMPLING_MIN_CLASS_ROWS)
+            sample = pd.concat([
+                DatasetSampler._keep_smallest(None, reservoir, quotas[value])
+                for value, reservoir in reservoirs.items()
+            ])
+        else:
+            sample = reservoirs[None]
+
+        return sample.drop(columns=SAMPLE_KEY).sort_index().reset_index(drop=True), total_rows
+
+    @staticmethod
+    def _keep_smallest(reservoir: Optional[pd.DataFrame], rows: pd.DataFrame, n_rows: int) -> pd.DataFrame:
+        """Merge rows into a reservoir, keeping the n rows with the smallest priority."""
+        merged = rows if reservoir is None else pd.concat([reservoir, rows])
+        if len(merged) <= n_rows:
+            return merged
+        return merged.nsmallest(n_rows, SAMPLE_KEY)